@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
 from app.core.database import Base
-from app.models import participant, team, team_request
+from app.models import participant, team, team_request, roster_deletion, teammate_recommendation, admin_job
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
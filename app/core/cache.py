@@ -0,0 +1,101 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+# Named caches, for the admin cache statistics endpoint
+_registry: Dict[str, "TTLCache"] = {}
+
+def cache_stats() -> Dict[str, dict]:
+    """Get hit/miss statistics for every named cache"""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+class TTLCache:
+    """Small thread-safe in-process cache with per-entry expiry and LRU eviction"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 10.0, name: Optional[str] = None):
+        if name:
+            _registry[name] = self
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any], coalesce: bool = False) -> Any:
+        """Return the cached value for key, computing and storing it on a miss.
+
+        With coalesce=True, concurrent misses for the same key wait for a single
+        computation instead of each running their own.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if not coalesce:
+            value = compute()
+            self.set(key, value)
+            return value
+
+        with self._lock:
+            flight = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with flight:
+                # Whoever waited behind the computing caller finds its result here
+                value = self._peek(key)
+                if value is _MISSING:
+                    value = compute()
+                    self.set(key, value)
+                return value
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight and not flight.locked():
+                    del self._inflight[key]
+
+    def _peek(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < time.monotonic():
+                return _MISSING
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -23,6 +23,44 @@ class Settings(BaseSettings):
     # CORS
     allowed_origins: list = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,https://mathrix-frontend.onrender.com").split(",")
     
+    # Search
+    search_result_limit: int = int(os.getenv("SEARCH_RESULT_LIMIT", "10"))
+    search_cache_ttl_seconds: float = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "15"))
+    
+    # Discovery
+    compatibility_index_k: int = int(os.getenv("COMPATIBILITY_INDEX_K", "50"))
+    compatibility_index_rebuild_seconds: float = float(os.getenv("COMPATIBILITY_INDEX_REBUILD_SECONDS", "600"))
+    
+    discovery_cache_entries: int = int(os.getenv("DISCOVERY_CACHE_ENTRIES", "5000"))
+    discovery_cache_ttl_seconds: float = float(os.getenv("DISCOVERY_CACHE_TTL_SECONDS", "300"))
+    roster_poll_seconds: float = float(os.getenv("ROSTER_POLL_SECONDS", "1"))
+    recommendation_batch_k: int = int(os.getenv("RECOMMENDATION_BATCH_K", "10"))
+    scoring_profile_path: Optional[str] = os.getenv("SCORING_PROFILE_PATH")  # JSON; built-in rules if unset
+    
+    # Admin summaries
+    summary_cache_ttl_seconds: float = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "300"))
+    counter_reconcile_seconds: float = float(os.getenv("COUNTER_RECONCILE_SECONDS", "30"))
+    overview_cache_ttl_seconds: float = float(os.getenv("OVERVIEW_CACHE_TTL_SECONDS", "5"))
+    
+    # Live events
+    event_heartbeat_seconds: float = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+    event_queue_size: int = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+    
+    # Request expiry
+    request_expiry_days: int = int(os.getenv("REQUEST_EXPIRY_DAYS", "7"))
+    request_sweep_seconds: float = float(os.getenv("REQUEST_SWEEP_SECONDS", "300"))
+    request_sweep_batch_size: int = int(os.getenv("REQUEST_SWEEP_BATCH_SIZE", "1000"))
+    
+    # Auto-assignment
+    auto_assign_time_budget_seconds: float = float(os.getenv("AUTO_ASSIGN_TIME_BUDGET_SECONDS", "2"))
+    auto_assign_workers: int = int(os.getenv("AUTO_ASSIGN_WORKERS", "1"))  # >1 shards large pools (see benchmark_auto_assign.py)
+    simulation_max_iterations: int = int(os.getenv("SIMULATION_MAX_ITERATIONS", "200000"))
+    simulation_time_limit_seconds: float = float(os.getenv("SIMULATION_TIME_LIMIT_SECONDS", "120"))  # safety net only
+    
+    # Background jobs
+    job_workers: int = int(os.getenv("JOB_WORKERS", "2"))
+    job_heartbeat_seconds: float = float(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+    
     # Email (optional for now)
     smtp_server: Optional[str] = os.getenv("SMTP_SERVER")
     smtp_port: Optional[int] = int(os.getenv("SMTP_PORT", "587")) if os.getenv("SMTP_PORT") else None
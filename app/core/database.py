@@ -1,6 +1,7 @@
+from contextlib import contextmanager
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
 engine = create_engine(
@@ -221,10 +222,168 @@ def migrate_existing_tables():
                         
                 except Exception as migrate_error:
                     print(f"⚠️ Warning: Could not migrate participants table: {migrate_error}")
+            
+            # Trigram indexes backing search-as-you-type on names and USNs
+            try:
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_participants_name_trgm
+                    ON participants USING gin (name gin_trgm_ops)
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_participants_usn_trgm
+                    ON participants USING gin (usn gin_trgm_ops)
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_teams_team_name_trgm
+                    ON teams USING gin (team_name gin_trgm_ops)
+                """))
+                connection.commit()
+            except Exception as index_error:
+                connection.rollback()
+                print(f"⚠️ Warning: Could not create search indexes: {index_error}")
+            
+            # Indexes backing discovery filter push-down
+            try:
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_participants_team_id ON participants(team_id)
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_participants_skills_gin
+                    ON participants USING gin ((skills::jsonb))
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_teams_unlocked ON teams(team_id) WHERE is_locked = FALSE
+                """))
+                connection.commit()
+            except Exception as index_error:
+                connection.rollback()
+                print(f"⚠️ Warning: Could not create discovery indexes: {index_error}")
+            
+            # Change sequence and tombstones backing the roster change feeds
+            try:
+                connection.execute(text("CREATE SEQUENCE IF NOT EXISTS roster_change_seq"))
+                # Takes a transaction id before drawing a value, so the change horizon
+                # (app.core.roster.ChangeHorizon) can tell when every holder has finished
+                connection.execute(text("""
+                    CREATE OR REPLACE FUNCTION roster_next_change_seq() RETURNS BIGINT
+                    LANGUAGE plpgsql VOLATILE AS $$
+                    BEGIN
+                        PERFORM pg_current_xact_id();
+                        RETURN nextval('roster_change_seq');
+                    END
+                    $$
+                """))
+                for table_name in ("participants", "teams"):
+                    connection.execute(text(f"""
+                        ALTER TABLE {table_name}
+                        ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT roster_next_change_seq()
+                    """))
+                    connection.execute(text(f"""
+                        ALTER TABLE {table_name} ALTER COLUMN change_seq SET DEFAULT roster_next_change_seq()
+                    """))
+                    connection.execute(text(f"""
+                        CREATE INDEX IF NOT EXISTS idx_{table_name}_change_seq ON {table_name}(change_seq)
+                    """))
+                connection.execute(text("""
+                    CREATE TABLE IF NOT EXISTS roster_deletions (
+                        change_seq BIGINT PRIMARY KEY DEFAULT roster_next_change_seq(),
+                        entity_type VARCHAR(20) NOT NULL,
+                        entity_id UUID NOT NULL,
+                        deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """))
+                connection.execute(text("""
+                    ALTER TABLE roster_deletions ALTER COLUMN change_seq SET DEFAULT roster_next_change_seq()
+                """))
+                connection.commit()
+            except Exception as feed_error:
+                connection.rollback()
+                print(f"⚠️ Warning: Could not set up change feed columns: {feed_error}")
+            
+            # Precomputed teammate recommendations (batch job output)
+            try:
+                connection.execute(text("""
+                    CREATE TABLE IF NOT EXISTS teammate_recommendations (
+                        participant_id UUID NOT NULL REFERENCES participants(participant_id) ON DELETE CASCADE,
+                        rank INTEGER NOT NULL,
+                        candidate_id UUID NOT NULL REFERENCES participants(participant_id) ON DELETE CASCADE,
+                        compatibility_score INTEGER NOT NULL,
+                        computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (participant_id, rank)
+                    )
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_teammate_recommendations_candidate ON teammate_recommendations(candidate_id)
+                """))
+                connection.commit()
+            except Exception as recommendation_error:
+                connection.rollback()
+                print(f"⚠️ Warning: Could not create teammate_recommendations table: {recommendation_error}")
+            
+            # Background admin jobs
+            try:
+                connection.execute(text("""
+                    CREATE TABLE IF NOT EXISTS admin_jobs (
+                        job_id UUID PRIMARY KEY,
+                        kind VARCHAR(50) NOT NULL,
+                        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                        params JSON NULL,
+                        progress DOUBLE PRECISION NOT NULL DEFAULT 0,
+                        message TEXT NULL,
+                        result JSON NULL,
+                        error TEXT NULL,
+                        cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+                        worker_id VARCHAR(32) NULL,
+                        heartbeat_at TIMESTAMP NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        started_at TIMESTAMP NULL,
+                        finished_at TIMESTAMP NULL
+                    )
+                """))
+                connection.execute(text("""
+                    ALTER TABLE admin_jobs ADD COLUMN IF NOT EXISTS worker_id VARCHAR(32) NULL
+                """))
+                connection.execute(text("""
+                    ALTER TABLE admin_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP NULL
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_admin_jobs_created_at ON admin_jobs(created_at DESC)
+                """))
+                connection.commit()
+            except Exception as jobs_error:
+                connection.rollback()
+                print(f"⚠️ Warning: Could not create admin_jobs table: {jobs_error}")
+            
+            # Request lookups by recipient and sender (unread counts, summaries, paged inboxes) and the expiry sweep
+            try:
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_team_requests_to_status ON team_requests(to_participant_id, status)
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_team_requests_from_status ON team_requests(from_participant_id, status)
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_team_requests_to_created ON team_requests(to_participant_id, created_at DESC, request_id DESC)
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_team_requests_from_created ON team_requests(from_participant_id, created_at DESC, request_id DESC)
+                """))
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_team_requests_pending_created ON team_requests(created_at) WHERE status = 'pending'
+                """))
+                connection.commit()
+            except Exception as request_index_error:
+                connection.rollback()
+                print(f"⚠️ Warning: Could not create team_requests index: {request_index_error}")
                     
     except Exception as e:
         print(f"⚠️ Warning: Could not migrate existing tables: {e}")
 
+def escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards so user input is matched literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 def get_db():
     db = SessionLocal()
     try:
@@ -232,4 +391,17 @@ def get_db():
     finally:
         db.close()
 
+@contextmanager
+def snapshot_session():
+    """Read-only session whose queries all see one REPEATABLE READ snapshot"""
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="REPEATABLE READ")
+        db = Session(bind=connection)
+        try:
+            db.execute(text("SET TRANSACTION READ ONLY"))
+            yield db
+        finally:
+            db.rollback()
+            db.close()
+
 # Tables will be created on startup via main.py
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import select
+import threading
+import uuid
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import engine
+
+NOTIFY_CHANNEL = "team_request_events"
+
+class EventBroker:
+    """Per-participant in-process pub/sub, fanned out to other workers with Postgres NOTIFY.
+
+    publish() delivers to this worker's subscribers right away and sends a NOTIFY
+    tagged with this worker's id; the listener thread of every other worker
+    delivers it to theirs. Subscribers are asyncio queues, filled thread-safely
+    through their event loop, so publishing works from any thread.
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+
+    def publish(self, participant_id: str, event: str, data: dict) -> None:
+        """Send an event to every open stream of a participant, on all workers"""
+        self.publish_many([(participant_id, event, data)])
+
+    def publish_many(self, events: Iterable[Tuple[str, str, dict]]) -> None:
+        """Send (participant_id, event, data) events, fanned out with one NOTIFY statement for all of them"""
+        messages = [{"participant_id": str(participant_id), "event": event, "data": data} for participant_id, event, data in events]
+        if not messages:
+            return
+        for message in messages:
+            self._deliver(message)
+        payloads = [json.dumps({**message, "origin": self.worker_id}, default=str) for message in messages]
+        try:
+            with engine.connect() as connection:
+                connection.execute(
+                    text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+                    {"channel": NOTIFY_CHANNEL, "payloads": payloads}
+                )
+                connection.commit()
+        except Exception as e:
+            print(f"⚠️ Warning: Could not fan out {len(messages)} events: {e}")
+
+    async def stream(self, participant_id: str) -> AsyncIterator[Optional[dict]]:
+        """Yield a participant's events as they arrive, or None after each idle heartbeat interval"""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=settings.event_queue_size))
+        with self._lock:
+            self._subscribers[str(participant_id)].add(subscriber)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), timeout=settings.event_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(str(participant_id))
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[str(participant_id)]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def _deliver(self, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(message["participant_id"], ()))
+        event = {"event": message["event"], "data": message["data"]}
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(_offer, queue, event)
+
+def _offer(queue: asyncio.Queue, event: dict) -> None:
+    # A stream that stopped reading loses events rather than growing without bound
+    if not queue.full():
+        queue.put_nowait(event)
+
+event_broker = EventBroker()
+
+_listener_stop = threading.Event()
+
+def _listen() -> None:
+    while not _listener_stop.is_set():
+        connection = None
+        try:
+            # A dedicated connection: detached so its LISTEN never leaks back into the pool
+            connection = engine.raw_connection()
+            connection.detach()
+            listener = connection.driver_connection
+            listener.autocommit = True
+            with listener.cursor() as cursor:
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            while not _listener_stop.is_set():
+                if select.select([listener], [], [], 1.0)[0]:
+                    listener.poll()
+                    while listener.notifies:
+                        notify = listener.notifies.pop(0)
+                        message = json.loads(notify.payload)
+                        if message.pop("origin", None) != event_broker.worker_id:
+                            event_broker._deliver(message)
+        except Exception as e:
+            print(f"⚠️ Warning: Event listener disconnected: {e}")
+            _listener_stop.wait(5)
+        finally:
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+def start_event_listener() -> None:
+    """LISTEN for events published by other workers and deliver them to local streams"""
+    _listener_stop.clear()
+    thread = threading.Thread(target=_listen, name="event-listener", daemon=True)
+    thread.start()
+
+def stop_event_listener() -> None:
+    _listener_stop.set()
@@ -0,0 +1,118 @@
+import threading
+from collections import deque
+from typing import Deque, Optional, Tuple
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import engine
+
+class RosterVersion:
+    """Process-local version number of the participant/team roster.
+
+    Bumped by repository write paths in this worker, and by a watcher thread when
+    roster_change_seq shows that another worker has written. Caches key on it so a
+    roster change makes every older entry unreachable without a DB round trip.
+    """
+
+    def __init__(self):
+        self._value = 0
+        self._seen_cursor = None
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    def observe(self, cursor: int) -> None:
+        """Bump the version if the DB change cursor moved since last observed"""
+        with self._lock:
+            if cursor != self._seen_cursor:
+                if self._seen_cursor is not None:
+                    self._value += 1
+                self._seen_cursor = cursor
+
+roster_version = RosterVersion()
+
+class ChangeHorizon:
+    """Highest change_seq below which no transaction can still commit a row.
+
+    Sequence values are handed out before their transaction commits, so a row with a
+    lower change_seq can become visible after one with a higher value: a reader that
+    moved its cursor to the highest value it saw would skip it for good. Each
+    observation records the sequence's last value together with the snapshot xmax
+    taken right after it, and the value becomes the horizon once the snapshot xmin
+    is at or past that xmax, i.e. every transaction id below it has finished.
+
+    That only covers the writers if each of them had a transaction id before it drew
+    its value. nextval() alone does not assign one (a statement gets it when it first
+    writes a row, after its defaults are evaluated), so change_seq is only ever drawn
+    through roster_next_change_seq(), which calls pg_current_xact_id() first (see
+    migrate_existing_tables). A value at or below the recorded last_value was then
+    drawn by a transaction whose id predates the snapshot, so it is below the xmax.
+    Change feed cursors never move past the horizon.
+    """
+
+    def __init__(self):
+        self._value: Optional[int] = None
+        self._pending: Deque[Tuple[int, int]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> Optional[int]:
+        return self._value
+
+    def current(self) -> int:
+        """The horizon, observed now if it never has been"""
+        if self._value is None:
+            self.observe()
+        return self._value or 0
+
+    def observe(self) -> int:
+        """Read the sequence and the running transactions, advancing the horizon if it can"""
+        with engine.connect() as connection:
+            last_value = connection.execute(text("SELECT last_value FROM roster_change_seq")).scalar()
+            # A separate statement, so its snapshot is taken after last_value was read
+            xmin, xmax = connection.execute(text(
+                "SELECT pg_snapshot_xmin(s)::text::bigint, pg_snapshot_xmax(s)::text::bigint FROM pg_current_snapshot() s"
+            )).one()
+        roster_version.observe(last_value)
+        with self._lock:
+            # An unchanged value keeps its earlier (lower) xmax, so a long transaction adds no entries
+            if not self._pending or self._pending[-1][0] != last_value:
+                self._pending.append((last_value, xmax))
+            while self._pending and self._pending[0][1] <= xmin:
+                value = self._pending.popleft()[0]
+                self._value = max(self._value or 0, value)
+            if self._value is None:
+                # Nothing has settled yet, so no value is known to be safe
+                self._value = 0
+            return self._value
+
+change_horizon = ChangeHorizon()
+
+_watcher_stop = threading.Event()
+
+def _watch_roster(interval: float) -> None:
+    while not _watcher_stop.wait(interval):
+        try:
+            change_horizon.observe()
+        except Exception as e:
+            print(f"⚠️ Warning: Roster watcher could not read change sequence: {e}")
+
+def start_roster_watcher() -> None:
+    """Poll the roster change sequence so writes from other workers bump the local version"""
+    _watcher_stop.clear()
+    thread = threading.Thread(
+        target=_watch_roster,
+        args=(settings.roster_poll_seconds,),
+        name="roster-watcher",
+        daemon=True
+    )
+    thread.start()
+
+def stop_roster_watcher() -> None:
+    _watcher_stop.set()
@@ -8,6 +8,12 @@ import time
 import os
 from app.routers import auth, participants, teams, team_formation, admin
 from app.core.database import create_missing_tables, migrate_existing_tables
+from app.core.roster import start_roster_watcher, stop_roster_watcher
+from app.core.events import start_event_listener, stop_event_listener
+from app.repositories.skill_index import warm_skill_index
+from app.repositories.counter_store import start_counter_reconciler, stop_counter_reconciler
+from app.services.request_sweeper import start_request_sweeper, stop_request_sweeper
+from app.services.job_runner import job_runner
 
 app = FastAPI(
     title="Mathrix API",
@@ -128,11 +134,22 @@ async def startup_event():
         print("✅ Database tables initialized successfully!")
     except Exception as e:
         print(f"⚠️ Warning: Database initialization failed: {e}")
+    start_roster_watcher()
+    warm_skill_index()
+    start_counter_reconciler()
+    start_event_listener()
+    start_request_sweeper()
+    job_runner.start()
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     print("🛑 Shutting down Mathrix API...")
+    stop_roster_watcher()
+    stop_counter_reconciler()
+    stop_event_listener()
+    stop_request_sweeper()
+    job_runner.shutdown()
 
 # Global exception handler
 @app.exception_handler(Exception)
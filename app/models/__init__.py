@@ -1,4 +1,7 @@
 from .participant import Participant
 from .team import Team
+from .roster_deletion import RosterDeletion
+from .teammate_recommendation import TeammateRecommendation
+from .admin_job import AdminJob
 
-__all__ = ["Participant", "Team"]
+__all__ = ["Participant", "Team", "RosterDeletion", "TeammateRecommendation", "AdminJob"]
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, DateTime, Boolean, Float, Text, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+class AdminJob(Base):
+    """A long-running admin operation executed by the background job runner"""
+    __tablename__ = "admin_jobs"
+    
+    job_id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    params = Column(JSON, nullable=True)
+    progress = Column(Float, nullable=False, default=0.0)
+    message = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    worker_id = Column(String(32), nullable=True)  # the process running the job
+    heartbeat_at = Column(DateTime, nullable=True)  # refreshed while that process is alive
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<AdminJob(kind='{self.kind}', status='{self.status}', progress={self.progress})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, DateTime, BigInteger, ForeignKey, Text, JSON, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,13 @@ class Participant(Base):
     skills = Column(JSON, nullable=False)  # Store skills as JSON array
     team_id = Column(UUID(as_uuid=False), ForeignKey("teams.team_id"), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
+    # Bumped from the shared roster_change_seq on every insert/update (change feeds)
+    change_seq = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text("roster_next_change_seq()"),
+        onupdate=func.roster_next_change_seq()
+    )
     
     # Relationships
     team = relationship("Team", back_populates="members", foreign_keys=[team_id])
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class RosterDeletion(Base):
+    """Tombstone for a deleted participant or team, so change feeds can report removals"""
+    __tablename__ = "roster_deletions"
+    
+    change_seq = Column(BigInteger, primary_key=True, server_default=text("roster_next_change_seq()"))
+    entity_type = Column(String(20), nullable=False)  # participant, team
+    entity_id = Column(UUID(as_uuid=False), nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<RosterDeletion(type='{self.entity_type}', id='{self.entity_id}', seq={self.change_seq})>"
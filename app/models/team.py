@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, String, DateTime, BigInteger, ForeignKey, Boolean, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,6 +17,13 @@ class Team(Base):
     max_members = Column(String(10), default="4")  # Flexible team size
     tags = Column(String(200), nullable=True)  # Team tags (comma-separated)
     created_at = Column(DateTime, server_default=func.now())
+    # Bumped from the shared roster_change_seq on every insert/update (change feeds)
+    change_seq = Column(
+        BigInteger,
+        nullable=False,
+        server_default=text("roster_next_change_seq()"),
+        onupdate=func.roster_next_change_seq()
+    )
     
     # Relationships
     leader = relationship("Participant", foreign_keys=[leader_id])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -17,6 +17,14 @@ class TeamRequest(Base):
     created_at = Column(DateTime, server_default=func.now())
     responded_at = Column(DateTime, nullable=True)
     
+    __table_args__ = (
+        Index("idx_team_requests_to_status", "to_participant_id", "status"),
+        Index("idx_team_requests_from_status", "from_participant_id", "status"),
+        Index("idx_team_requests_to_created", "to_participant_id", created_at.desc(), request_id.desc()),
+        Index("idx_team_requests_from_created", "from_participant_id", created_at.desc(), request_id.desc()),
+        Index("idx_team_requests_pending_created", "created_at", postgresql_where=(status == "pending")),
+    )
+    
     # Relationships
     from_participant = relationship("Participant", foreign_keys=[from_participant_id])
     to_participant = relationship("Participant", foreign_keys=[to_participant_id])
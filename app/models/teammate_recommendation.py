@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class TeammateRecommendation(Base):
+    """One precomputed teammate recommendation, written by the batch recommendation job"""
+    __tablename__ = "teammate_recommendations"
+    
+    participant_id = Column(UUID(as_uuid=False), ForeignKey("participants.participant_id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    candidate_id = Column(UUID(as_uuid=False), ForeignKey("participants.participant_id", ondelete="CASCADE"), nullable=False)
+    compatibility_score = Column(Integer, nullable=False)
+    computed_at = Column(DateTime, server_default=func.now())
+    
+    def __repr__(self):
+        return f"<TeammateRecommendation(participant='{self.participant_id}', rank={self.rank}, candidate='{self.candidate_id}')>"
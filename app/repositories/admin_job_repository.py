@@ -0,0 +1,92 @@
+from datetime import timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.models.admin_job import AdminJob
+
+class AdminJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def create(self, kind: str, params: Optional[dict], worker_id: Optional[str] = None) -> AdminJob:
+        job = AdminJob(kind=kind, params=params, status="queued", worker_id=worker_id, heartbeat_at=func.now())
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+    
+    def get_by_id(self, job_id: str) -> Optional[AdminJob]:
+        return self.db.query(AdminJob).filter(AdminJob.job_id == str(job_id)).first()
+    
+    def get_recent(self, limit: int = 50) -> List[AdminJob]:
+        return self.db.query(AdminJob).order_by(AdminJob.created_at.desc()).limit(limit).all()
+    
+    def update(self, job_id: str, **fields) -> None:
+        self.db.query(AdminJob).filter(AdminJob.job_id == str(job_id)).update(fields, synchronize_session=False)
+        self.db.commit()
+    
+    def mark_running(self, job_id: str) -> bool:
+        """Move a queued job to running; False if it was cancelled before it started"""
+        updated = self.db.query(AdminJob).filter(
+            AdminJob.job_id == str(job_id),
+            AdminJob.status == "queued",
+            AdminJob.cancel_requested == False
+        ).update({AdminJob.status: "running", AdminJob.started_at: func.now()}, synchronize_session=False)
+        self.db.commit()
+        return updated == 1
+    
+    def finish(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None) -> bool:
+        """Close a running job; False if it was already closed (failed by a shutdown or as stale)"""
+        fields = {AdminJob.status: status, AdminJob.result: result, AdminJob.error: error, AdminJob.finished_at: func.now()}
+        if status == "succeeded":
+            fields[AdminJob.progress] = 1.0
+        updated = self.db.query(AdminJob).filter(
+            AdminJob.job_id == str(job_id),
+            AdminJob.status == "running"
+        ).update(fields, synchronize_session=False)
+        self.db.commit()
+        return updated == 1
+    
+    def heartbeat(self, worker_id: str) -> None:
+        """Mark the unfinished jobs owned by a worker as still alive"""
+        self.db.query(AdminJob).filter(
+            AdminJob.worker_id == worker_id,
+            AdminJob.status.in_(("queued", "running"))
+        ).update({AdminJob.heartbeat_at: func.now()}, synchronize_session=False)
+        self.db.commit()
+    
+    def fail_stale(self, stale_seconds: float) -> int:
+        """Fail unfinished jobs whose worker stopped heartbeating (killed or restarted); returns how many"""
+        failed = self.db.query(AdminJob).filter(
+            AdminJob.status.in_(("queued", "running")),
+            (AdminJob.heartbeat_at == None) | (AdminJob.heartbeat_at < func.now() - timedelta(seconds=stale_seconds))
+        ).update({
+            AdminJob.status: "failed",
+            AdminJob.error: "Worker stopped before the job finished",
+            AdminJob.finished_at: func.now()
+        }, synchronize_session=False)
+        self.db.commit()
+        return failed
+    
+    def fail_unfinished(self, worker_id: str, error: str) -> None:
+        """Fail every queued or running job owned by a worker"""
+        self.db.query(AdminJob).filter(
+            AdminJob.worker_id == worker_id,
+            AdminJob.status.in_(("queued", "running"))
+        ).update({AdminJob.status: "failed", AdminJob.error: error, AdminJob.finished_at: func.now()}, synchronize_session=False)
+        self.db.commit()
+    
+    def request_cancel(self, job_id: str) -> None:
+        """Flag a job for cancellation; queued jobs are cancelled outright"""
+        self.db.query(AdminJob).filter(
+            AdminJob.job_id == str(job_id),
+            AdminJob.status == "queued"
+        ).update({AdminJob.status: "cancelled", AdminJob.finished_at: func.now()}, synchronize_session=False)
+        self.db.query(AdminJob).filter(AdminJob.job_id == str(job_id)).update(
+            {AdminJob.cancel_requested: True}, synchronize_session=False
+        )
+        self.db.commit()
+    
+    def is_cancel_requested(self, job_id: str) -> bool:
+        return bool(self.db.query(AdminJob.cancel_requested).filter(AdminJob.job_id == str(job_id)).scalar())
+
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import snapshot_session
+from app.models.participant import Participant
+from app.models.team import Team
+from app.models.team_request import TeamRequest
+
+FULL_TEAM_SIZE = 4
+
+class CounterStore:
+    """Live dashboard totals kept in memory and adjusted by the repository write paths.
+
+    Reads never touch the database. Writes made by other workers (and anything a hook
+    misses) are folded in by a periodic reconcile, which recounts everything from one
+    snapshot; drift is therefore bounded by the reconcile interval.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._participants = 0
+        self._assigned = 0
+        self._pending_requests = 0
+        self._team_sizes: Dict[str, int] = {}
+        self._full_teams = 0
+        self._reconciled_at: Optional[float] = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "participants": self._participants,
+                "assigned": self._assigned,
+                "unassigned": self._participants - self._assigned,
+                "teams": len(self._team_sizes),
+                "full_teams": self._full_teams,
+                "pending_requests": self._pending_requests,
+                "reconciled_at": self._reconciled_at,
+                "seconds_since_reconcile": round(time.time() - self._reconciled_at, 1) if self._reconciled_at else None
+            }
+
+    def reconcile(self, db: Session) -> None:
+        """Replace every counter with a fresh count from the database"""
+        participants, assigned = db.query(
+            func.count(Participant.participant_id),
+            func.count(Participant.team_id)
+        ).one()
+        team_sizes = dict(db.query(Team.team_id, func.count(Participant.participant_id)).outerjoin(
+            Participant, Participant.team_id == Team.team_id
+        ).group_by(Team.team_id).all())
+        pending = db.query(func.count(TeamRequest.request_id)).filter(TeamRequest.status == "pending").scalar()
+
+        with self._lock:
+            self._participants = participants
+            self._assigned = assigned
+            self._team_sizes = {str(team_id): size for team_id, size in team_sizes.items()}
+            self._full_teams = sum(1 for size in self._team_sizes.values() if size == FULL_TEAM_SIZE)
+            self._pending_requests = pending
+            self._reconciled_at = time.time()
+
+    # Write hooks, called after the corresponding commit
+
+    def participant_created(self, team_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._participants += 1
+            if team_id:
+                self._resize(str(team_id), 1)
+
+    def participant_deleted(self, team_id: Optional[str] = None) -> None:
+        with self._lock:
+            self._participants -= 1
+            if team_id:
+                self._resize(str(team_id), -1)
+
+    def member_moved(self, from_team_id: Optional[str], to_team_id: Optional[str], count: int = 1) -> None:
+        """Participants left from_team_id (None: were unassigned) for to_team_id (None: left the team)"""
+        with self._lock:
+            if from_team_id:
+                self._resize(str(from_team_id), -count)
+            if to_team_id:
+                self._resize(str(to_team_id), count)
+
+    def team_created(self, team_id: str) -> None:
+        with self._lock:
+            self._team_sizes.setdefault(str(team_id), 0)
+
+    def team_deleted(self, team_id: str) -> None:
+        with self._lock:
+            size = self._team_sizes.pop(str(team_id), 0)
+            self._assigned -= size
+            if size == FULL_TEAM_SIZE:
+                self._full_teams -= 1
+
+    def requests_opened(self, count: int = 1) -> None:
+        with self._lock:
+            self._pending_requests += count
+
+    def requests_closed(self, count: int = 1) -> None:
+        """Pending requests were answered, cancelled or expired"""
+        with self._lock:
+            self._pending_requests -= count
+
+    def _resize(self, team_id: str, delta: int) -> None:
+        before = self._team_sizes.get(team_id, 0)
+        after = max(before + delta, 0)
+        self._team_sizes[team_id] = after
+        self._assigned += after - before
+        self._full_teams += (after == FULL_TEAM_SIZE) - (before == FULL_TEAM_SIZE)
+
+counter_store = CounterStore()
+
+_reconciler_stop = threading.Event()
+
+def _reconcile_loop(interval: float) -> None:
+    while True:
+        try:
+            with snapshot_session() as db:
+                counter_store.reconcile(db)
+        except Exception as e:
+            print(f"⚠️ Warning: Counter reconcile failed: {e}")
+        if _reconciler_stop.wait(interval):
+            return
+
+def start_counter_reconciler() -> None:
+    """Load the counters now and recount them periodically in the background"""
+    _reconciler_stop.clear()
+    thread = threading.Thread(
+        target=_reconcile_loop,
+        args=(settings.counter_reconcile_seconds,),
+        name="counter-reconciler",
+        daemon=True
+    )
+    thread.start()
+
+def stop_counter_reconciler() -> None:
+    _reconciler_stop.set()
@@ -1,9 +1,16 @@
+import heapq
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, text, cast, Text, true
+from sqlalchemy.dialects.postgresql import JSONB, array
 from typing import List, Optional, Dict
 from uuid import UUID
 from app.models.participant import Participant
 from app.models.team import Team
+from app.models.roster_deletion import RosterDeletion
+from app.core.database import escape_like
+from app.core.roster import roster_version
+from app.repositories.skill_index import skill_index
+from app.repositories.counter_store import counter_store
 
 class ParticipantRepository:
     def __init__(self, db: Session):
@@ -13,7 +20,10 @@ class ParticipantRepository:
         db_participant = Participant(**participant_data)
         self.db.add(db_participant)
         self.db.commit()
+        roster_version.bump()
         self.db.refresh(db_participant)
+        skill_index.upsert(db_participant.participant_id, db_participant.skills, db_participant.team_id)
+        counter_store.participant_created(db_participant.team_id)
         return db_participant
     
     def get_by_id(self, participant_id: UUID) -> Optional[Participant]:
@@ -28,23 +38,63 @@ class ParticipantRepository:
     def get_all(self) -> List[Participant]:
         return self.db.query(Participant).all()
     
+    def search(self, query: str, limit: int = 10) -> List[Participant]:
+        """Substring/fuzzy match on name and prefix match on USN (pg_trgm indexed)"""
+        escaped = escape_like(query)
+        return self.db.query(Participant).filter(
+            or_(
+                Participant.name.ilike(f"%{escaped}%", escape="\\"),
+                Participant.usn.ilike(f"{escaped}%", escape="\\"),
+                Participant.name.op("%")(query)
+            )
+        ).order_by(
+            func.greatest(
+                func.similarity(Participant.name, query),
+                func.similarity(Participant.usn, query)
+            ).desc(),
+            Participant.name
+        ).limit(limit).all()
+    
     def update(self, participant_id: UUID, participant_data: dict) -> Optional[Participant]:
         participant = self.get_by_id(participant_id)
         if participant:
+            previous_team_id = participant.team_id
             for field, value in participant_data.items():
                 setattr(participant, field, value)
+            if participant.team_id != previous_team_id:
+                self._touch_teams(previous_team_id, participant.team_id)
             self.db.commit()
+            roster_version.bump()
             self.db.refresh(participant)
+            skill_index.upsert(participant.participant_id, participant.skills, participant.team_id)
+            if participant.team_id != previous_team_id:
+                counter_store.member_moved(previous_team_id, participant.team_id)
         return participant
     
     def delete(self, participant_id: UUID) -> bool:
         participant = self.get_by_id(participant_id)
         if participant:
+            team_id = participant.team_id
             self.db.delete(participant)
+            self.db.add(RosterDeletion(entity_type="participant", entity_id=participant.participant_id))
+            # The team loses a member, so it has to show up in the team change feed too
+            self._touch_teams(team_id)
             self.db.commit()
+            roster_version.bump()
+            skill_index.remove(participant.participant_id)
+            counter_store.participant_deleted(team_id)
             return True
         return False
     
+    def _touch_teams(self, *team_ids: Optional[str]) -> None:
+        """Bump the change_seq of teams whose membership changes (same UPDATE as TeamRepository._touch)"""
+        team_ids = [team_id for team_id in team_ids if team_id]
+        if team_ids:
+            self.db.query(Team).filter(Team.team_id.in_(team_ids)).update(
+                {Team.change_seq: func.roster_next_change_seq()},
+                synchronize_session=False
+            )
+    
     def get_unassigned_participants(self) -> List[Participant]:
         return self.db.query(Participant).filter(Participant.team_id.is_(None)).all()
     
@@ -59,6 +109,115 @@ class ParticipantRepository:
             )
         ).all()
     
+    def get_changed_since(self, since: int, limit: int) -> List[Participant]:
+        """Get participants inserted or updated after the given change cursor"""
+        return self.db.query(Participant).filter(
+            Participant.change_seq > since
+        ).order_by(Participant.change_seq).limit(limit).all()
+    
+    def get_deleted_since(self, since: int, limit: Optional[int] = None) -> List[RosterDeletion]:
+        """Get tombstones of participants deleted after the given change cursor"""
+        query = self.db.query(RosterDeletion).filter(
+            RosterDeletion.entity_type == "participant",
+            RosterDeletion.change_seq > since
+        ).order_by(RosterDeletion.change_seq)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    def get_roster_cursor(self) -> int:
+        """Get the latest value handed out by the roster change sequence"""
+        return self.db.execute(text("SELECT last_value FROM roster_change_seq")).scalar()
+    
+    def get_skill_rows(self, since: Optional[int] = None) -> list:
+        """Get (participant_id, skills, team_id) rows, optionally only those changed after a cursor"""
+        query = self.db.query(Participant.participant_id, Participant.skills, Participant.team_id)
+        if since is not None:
+            query = query.filter(Participant.change_seq > since)
+        return query.all()
+    
+    def get_unassigned_skill_rows(self) -> list:
+        """Get (participant_id, skills) rows of participants without a team"""
+        return self.db.query(Participant.participant_id, Participant.skills).filter(
+            Participant.team_id.is_(None)
+        ).all()
+    
+    def get_team_skill_rows(self, participant_id: UUID) -> list:
+        """Get (participant_id, skills, team_id) rows of a participant and their teammates, in one query"""
+        own_team = self.db.query(Participant.team_id).filter(
+            Participant.participant_id == str(participant_id)
+        ).scalar_subquery()
+        return self.db.query(Participant.participant_id, Participant.skills, Participant.team_id).filter(
+            or_(
+                Participant.participant_id == str(participant_id),
+                Participant.team_id == own_team
+            )
+        ).all()
+    
+    def get_roster_counts(self) -> Dict[str, int]:
+        """Get total and unassigned participant counts in one scan"""
+        total, unassigned = self.db.query(
+            func.count(Participant.participant_id),
+            func.count(Participant.participant_id).filter(Participant.team_id.is_(None))
+        ).one()
+        return {"total": total, "unassigned": unassigned}
+    
+    def count_unassigned(self) -> int:
+        return self.db.query(func.count(Participant.participant_id)).filter(
+            Participant.team_id.is_(None)
+        ).scalar()
+    
+    def get_unassigned_skill_counts(self) -> Dict[str, int]:
+        """Get how many unassigned participants have each skill, aggregated in SQL"""
+        return self.get_skill_counts(unassigned_only=True)
+    
+    def get_skill_counts(self, unassigned_only: bool = False) -> Dict[str, int]:
+        """Get how many participants have each skill, aggregated in SQL"""
+        skill = func.json_array_elements_text(Participant.skills).table_valued("value").lateral()
+        query = self.db.query(skill.c.value, func.count()).select_from(Participant).join(skill, true())
+        if unassigned_only:
+            query = query.filter(Participant.team_id.is_(None))
+        return {value: count for value, count in query.group_by(skill.c.value).all()}
+    
+    def get_by_ids(self, participant_ids: List[str]) -> List[Participant]:
+        if not participant_ids:
+            return []
+        return self.db.query(Participant).filter(
+            Participant.participant_id.in_([str(pid) for pid in participant_ids])
+        ).all()
+    
+    def get_discovery_candidates(
+        self,
+        exclude_participant_id: str,
+        skills: Optional[List[str]] = None,
+        max_team_size: Optional[int] = None,
+        include_locked_teams: bool = False
+    ) -> List[Participant]:
+        """Get participants that can be suggested as teammates, with discovery filters applied in SQL"""
+        joinable_teams = self.db.query(Team.team_id)
+        if not include_locked_teams:
+            joinable_teams = joinable_teams.filter(Team.is_locked == False)
+        if max_team_size is not None:
+            joinable_teams = joinable_teams.filter(
+                Team.team_id.in_(
+                    self.db.query(Participant.team_id).filter(
+                        Participant.team_id.isnot(None)
+                    ).group_by(Participant.team_id).having(func.count() < max_team_size)
+                )
+            )
+        
+        query = self.db.query(Participant).filter(
+            Participant.participant_id != str(exclude_participant_id),
+            or_(
+                Participant.team_id.is_(None),
+                Participant.team_id.in_(joinable_teams)
+            )
+        )
+        if skills:
+            # Served by the GIN index on (skills::jsonb)
+            query = query.filter(cast(Participant.skills, JSONB).op("?|")(array(skills, type_=Text)))
+        return query.all()
+    
     def get_participants_by_skill(self, skill: str) -> List[Participant]:
         """Get participants who have a specific skill"""
         return self.db.query(Participant).filter(
@@ -91,37 +250,34 @@ class ParticipantRepository:
         if not participant:
             return []
         
-        # Get current team members' skills
-        current_skills = set()
-        if participant.team_id:
-            team_members = self.get_team_members(participant.team_id)
-            for member in team_members:
-                if member.skills:
-                    current_skills.update(member.skills)
-        
-        # Add participant's own skills
-        if participant.skills:
-            current_skills.update(participant.skills)
+        skill_index.refresh(self.db)
         
-        # Find participants with different skills
-        available_participants = self.get_unassigned_participants()
-        suggestions = []
+        # Get current team members' skills plus the participant's own
+        current_skills = set(participant.skills or ())
+        if participant.team_id:
+            for member_id in skill_index.members(participant.team_id):
+                current_skills |= skill_index.skills_of(member_id)
         
-        for available_participant in available_participants:
-            if available_participant.participant_id == participant.participant_id:
-                continue
-                
-            # Calculate skill diversity score
-            if available_participant.skills:
-                new_skills = set(available_participant.skills) - current_skills
-                diversity_score = len(new_skills)
-                
-                if diversity_score > 0:
-                    suggestions.append((available_participant, diversity_score))
+        # Only unassigned participants posted under a skill the team lacks can add diversity
+        missing_skills = skill_index.vocabulary() - current_skills
+        if not missing_skills:
+            return []
+        candidates = skill_index.candidates(
+            exclude_participant_id=participant.participant_id,
+            skills=missing_skills,
+            unassigned_only=True
+        )
+        scored = [
+            (len(skill_index.skills_of(candidate_id) - current_skills), candidate_id)
+            for candidate_id in candidates
+        ]
         
         # Sort by diversity score and return top suggestions
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-        return [participant for participant, _ in suggestions[:max_suggestions]]
+        winners = [candidate_id for _, candidate_id in heapq.nsmallest(
+            max_suggestions, scored, key=lambda entry: (-entry[0], entry[1])
+        )]
+        by_id = {p.participant_id: p for p in self.get_by_ids(winners)}
+        return [by_id[candidate_id] for candidate_id in winners if candidate_id in by_id]
     
     def get_participants_with_skill_overlap(self, participant_id: UUID, min_overlap: int = 1) -> List[Participant]:
         """Get participants with skill overlap for team formation"""
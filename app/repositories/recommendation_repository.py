@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from typing import Iterator, List
+from app.models.teammate_recommendation import TeammateRecommendation
+
+# Rows per INSERT round trip when writing a batch
+INSERT_CHUNK_SIZE = 5000
+
+class RecommendationRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def replace_all(self, rows: Iterator[dict]) -> int:
+        """Replace every stored recommendation with the given rows in one transaction"""
+        written = 0
+        self.db.query(TeammateRecommendation).delete(synchronize_session=False)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= INSERT_CHUNK_SIZE:
+                self.db.execute(insert(TeammateRecommendation), chunk)
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            self.db.execute(insert(TeammateRecommendation), chunk)
+            written += len(chunk)
+        self.db.commit()
+        return written
+    
+    def get_for_participant(self, participant_id: str) -> List[TeammateRecommendation]:
+        return self.db.query(TeammateRecommendation).filter(
+            TeammateRecommendation.participant_id == participant_id
+        ).order_by(TeammateRecommendation.rank).all()
+    
+    def iter_all(self, batch_size: int = 5000) -> Iterator[TeammateRecommendation]:
+        """Stream every stored recommendation ordered by participant and rank"""
+        return self.db.query(TeammateRecommendation).order_by(
+            TeammateRecommendation.participant_id,
+            TeammateRecommendation.rank
+        ).yield_per(batch_size)
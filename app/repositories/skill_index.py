@@ -0,0 +1,287 @@
+import threading
+from collections import Counter, defaultdict, deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.roster import change_horizon
+from app.models.participant import Participant
+from app.models.team import Team
+from app.models.roster_deletion import RosterDeletion
+
+class SkillIndex:
+    """In-process skill -> participant postings, mirrored from the participants table.
+
+    Warmed at startup and updated by the repository write paths of this worker;
+    reads first replay the roster change feed (change_seq) so writes made by other
+    workers are picked up too; the replay cursor never passes the change horizon, so
+    rows committed out of sequence order are not skipped. Alongside the postings it keeps each participant's
+    skills and team, and the set of locked teams, so candidate generation and
+    availability checks need no participant rows from the database, plus a
+    per-team skill profile (how many members have each skill) maintained on every
+    membership change.
+
+    Every participant whose entry or availability changes is appended to a bounded
+    change log, numbered by a generation counter, so derived indexes can follow the
+    roster through changes_since() without reading the change feed themselves.
+    """
+
+    # Change log entries kept for changes_since(); a consumer further behind rebuilds
+    CHANGE_LOG_SIZE = 100_000
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._changes: Deque[Tuple[int, str]] = deque(maxlen=self.CHANGE_LOG_SIZE)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._skills: Dict[str, frozenset] = {}
+        self._team_of: Dict[str, Optional[str]] = {}
+        self._members: Dict[str, Set[str]] = defaultdict(set)
+        self._team_skills: Dict[str, Counter] = defaultdict(Counter)
+        self._locked_teams: Set[str] = set()
+        self._cursor: Optional[int] = None
+        self._seen: Optional[Tuple[int, int]] = None
+
+    @property
+    def is_warm(self) -> bool:
+        return self._cursor is not None
+
+    def warm(self, db: Session) -> None:
+        """Load the whole roster into the index"""
+        with self._lock:
+            # The cursor stops at the change horizon: rows past it are loaded now and replayed again
+            seen = (self._roster_cursor(db), change_horizon.current())
+            rows = db.query(Participant.participant_id, Participant.skills, Participant.team_id).all()
+            teams = db.query(Team.team_id).filter(Team.is_locked == True).all()
+
+            self._reset()
+            for row in rows:
+                self._store(row.participant_id, row.skills, row.team_id)
+            self._locked_teams = {team.team_id for team in teams}
+            self._cursor = min(seen)
+            self._seen = seen
+            # A fresh load: consumers cannot catch up from the log and must rebuild
+            self._changes.clear()
+            self._generation += 1
+
+    def refresh(self, db: Session) -> None:
+        """Apply roster changes recorded since the last refresh (warming on first use)"""
+        with self._lock:
+            if self._cursor is None:
+                self.warm(db)
+                return
+
+            # Replay again when the sequence moved or the horizon did (a lower change_seq may have committed late)
+            seen = (self._roster_cursor(db), change_horizon.current())
+            if seen == self._seen:
+                return
+
+            changed = db.query(Participant.participant_id, Participant.skills, Participant.team_id).filter(
+                Participant.change_seq > self._cursor
+            ).all()
+            deleted = db.query(RosterDeletion.entity_id).filter(
+                RosterDeletion.entity_type == "participant",
+                RosterDeletion.change_seq > self._cursor
+            ).all()
+            teams = db.query(Team.team_id, Team.is_locked).filter(Team.change_seq > self._cursor).all()
+
+            for row in changed:
+                self._store(row.participant_id, row.skills, row.team_id)
+            for tombstone in deleted:
+                self._drop(tombstone.entity_id)
+            for team_id, is_locked in teams:
+                self._set_locked(team_id, is_locked)
+            self._cursor = max(self._cursor, min(seen))
+            self._seen = seen
+
+    def _roster_cursor(self, db: Session) -> int:
+        return db.execute(text("SELECT last_value FROM roster_change_seq")).scalar()
+
+    # Write-through hooks for repository write paths (no-ops until the index is warm)
+
+    def upsert(self, participant_id: str, skills: Optional[Iterable[str]], team_id: Optional[str]) -> None:
+        with self._lock:
+            if self.is_warm:
+                self._store(str(participant_id), skills, team_id)
+
+    def remove(self, participant_id: str) -> None:
+        with self._lock:
+            if self.is_warm:
+                self._drop(str(participant_id))
+
+    def set_team(self, participant_id: str, team_id: Optional[str]) -> None:
+        with self._lock:
+            participant_id = str(participant_id)
+            if self.is_warm and participant_id in self._skills:
+                self._store(participant_id, self._skills[participant_id], team_id)
+
+    def disband_team(self, team_id: str) -> None:
+        with self._lock:
+            if self.is_warm:
+                for participant_id in list(self._members.get(team_id, ())):
+                    self._store(participant_id, self._skills[participant_id], None)
+                self._members.pop(team_id, None)
+                self._team_skills.pop(team_id, None)
+                self._locked_teams.discard(team_id)
+
+    def set_team_locked(self, team_id: str, is_locked: bool) -> None:
+        with self._lock:
+            if self.is_warm:
+                self._set_locked(team_id, is_locked)
+
+    # Change tracking for derived indexes
+
+    def snapshot(self) -> Tuple[int, List[Tuple[str, frozenset, bool]]]:
+        """The current generation and every participant as (participant_id, skills, available)"""
+        with self._lock:
+            return self._generation, [
+                (participant_id, skills, self._is_available(participant_id, None, False, False))
+                for participant_id, skills in self._skills.items()
+            ]
+
+    def changes_since(self, generation: int) -> Optional[Tuple[int, Dict[str, Optional[Tuple[frozenset, bool]]]]]:
+        """Participants changed after a generation, as {participant_id: (skills, available) or None if deleted}.
+
+        Returns None when the log no longer reaches back that far (or the index was
+        reloaded since), in which case the caller has to start again from snapshot().
+        """
+        with self._lock:
+            oldest = self._changes[0][0] if self._changes else self._generation + 1
+            if generation > self._generation or generation + 1 < oldest:
+                return None
+            changed = set()
+            for logged, participant_id in reversed(self._changes):
+                if logged <= generation:
+                    break
+                changed.add(participant_id)
+            return self._generation, {
+                participant_id: (
+                    (self._skills[participant_id], self._is_available(participant_id, None, False, False))
+                    if participant_id in self._skills else None
+                )
+                for participant_id in changed
+            }
+
+    def _log(self, participant_id: str) -> None:
+        self._generation += 1
+        self._changes.append((self._generation, participant_id))
+
+    # Lookups
+
+    def skills_of(self, participant_id: str) -> frozenset:
+        return self._skills.get(str(participant_id), frozenset())
+
+    def members(self, team_id: str) -> Set[str]:
+        with self._lock:
+            return set(self._members.get(team_id, ()))
+
+    def team_profile(self, team_id: str) -> Tuple[int, frozenset]:
+        """Member count and combined skills of a team"""
+        with self._lock:
+            skills = self._team_skills.get(team_id)
+            return len(self._members.get(team_id, ())), frozenset(skills) if skills else frozenset()
+
+    def skill_counts(self, skills: Iterable[str]) -> Dict[str, int]:
+        """Number of participants having each of the given skills"""
+        with self._lock:
+            return {skill: len(self._postings.get(skill, ())) for skill in set(skills)}
+
+    def vocabulary(self) -> Set[str]:
+        with self._lock:
+            return {skill for skill, postings in self._postings.items() if postings}
+
+    def postings(self, skills: Iterable[str]) -> Set[str]:
+        """Participants having at least one of the given skills (union of their postings)"""
+        with self._lock:
+            matched = set()
+            for skill in set(skills):
+                matched |= self._postings.get(skill, set())
+            return matched
+
+    def candidates(
+        self,
+        exclude_participant_id: Optional[str] = None,
+        skills: Optional[Iterable[str]] = None,
+        max_team_size: Optional[int] = None,
+        include_locked_teams: bool = False,
+        unassigned_only: bool = False
+    ) -> List[str]:
+        """Participant ids that can be suggested, sorted, with discovery filters applied in memory"""
+        with self._lock:
+            pool = self.postings(skills) if skills else set(self._skills)
+            pool.discard(str(exclude_participant_id))
+            return sorted(
+                participant_id for participant_id in pool
+                if self._is_available(participant_id, max_team_size, include_locked_teams, unassigned_only)
+            )
+
+    def _is_available(self, participant_id: str, max_team_size: Optional[int], include_locked_teams: bool, unassigned_only: bool) -> bool:
+        team_id = self._team_of.get(participant_id)
+        if not team_id:
+            return True
+        if unassigned_only:
+            return False
+        if not include_locked_teams and team_id in self._locked_teams:
+            return False
+        return max_team_size is None or len(self._members[team_id]) < max_team_size
+
+    def _store(self, participant_id: str, skills, team_id: Optional[str]) -> None:
+        previous_skills = self._skills.get(participant_id, ())
+        for skill in previous_skills:
+            self._postings[skill].discard(participant_id)
+        previous_team = self._team_of.get(participant_id)
+        if previous_team:
+            self._members[previous_team].discard(participant_id)
+            self._team_skills[previous_team].subtract(previous_skills)
+            self._team_skills[previous_team] += Counter()  # drop skills no member has any more
+
+        skills = frozenset(skills or ())
+        self._skills[participant_id] = skills
+        for skill in skills:
+            self._postings[skill].add(participant_id)
+        self._team_of[participant_id] = team_id
+        if team_id:
+            self._members[team_id].add(participant_id)
+            self._team_skills[team_id].update(skills)
+        self._log(participant_id)
+
+    def _drop(self, participant_id: str) -> None:
+        skills = self._skills.pop(participant_id, ())
+        for skill in skills:
+            self._postings[skill].discard(participant_id)
+        team_id = self._team_of.pop(participant_id, None)
+        if team_id:
+            self._members[team_id].discard(participant_id)
+            self._team_skills[team_id].subtract(skills)
+            self._team_skills[team_id] += Counter()
+        self._log(participant_id)
+
+    def _set_locked(self, team_id: str, is_locked: bool) -> None:
+        if is_locked == (team_id in self._locked_teams):
+            return
+        if is_locked:
+            self._locked_teams.add(team_id)
+        else:
+            self._locked_teams.discard(team_id)
+        # Locking or unlocking changes whether the members can be suggested
+        for participant_id in self._members.get(team_id, ()):
+            self._log(participant_id)
+
+skill_index = SkillIndex()
+
+def warm_skill_index() -> None:
+    """Load the skill index in the background so startup is not blocked"""
+    def _warm():
+        db = SessionLocal()
+        try:
+            skill_index.refresh(db)
+            print("✅ Skill index warmed")
+        except Exception as e:
+            print(f"⚠️ Warning: Skill index warm-up failed: {e}")
+        finally:
+            db.close()
+
+    threading.Thread(target=_warm, name="skill-index-warmup", daemon=True).start()
@@ -1,10 +1,16 @@
+from collections import Counter
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List, Optional, Dict
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, distinct, true, case, cast, Integer, insert, bindparam
+from typing import List, Optional, Dict, Tuple
 from app.models.team import Team
 from app.models.participant import Participant
+from app.models.roster_deletion import RosterDeletion
 from app.schemas.team import TeamCreate, TeamUpdate
+from app.core.database import escape_like
+from app.core.roster import roster_version
+from app.repositories.skill_index import skill_index
+from app.repositories.counter_store import counter_store
 
 class TeamRepository:
     def __init__(self, db: Session):
@@ -14,7 +20,9 @@ class TeamRepository:
         db_team = Team(**team_data.dict())
         self.db.add(db_team)
         self.db.commit()
+        roster_version.bump()
         self.db.refresh(db_team)
+        counter_store.team_created(db_team.team_id)
         return db_team
     
     def get_by_id(self, team_id: str) -> Optional[Team]:
@@ -26,6 +34,22 @@ class TeamRepository:
     def get_all(self) -> List[Team]:
         return self.db.query(Team).all()
     
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Team, int]]:
+        """Substring/fuzzy match on team name (pg_trgm indexed), with member counts"""
+        member_count = self.db.query(func.count(Participant.participant_id)).filter(
+            Participant.team_id == Team.team_id
+        ).correlate(Team).scalar_subquery()
+        
+        return self.db.query(Team, member_count.label("member_count")).filter(
+            or_(
+                Team.team_name.ilike(f"%{escape_like(query)}%", escape="\\"),
+                Team.team_name.op("%")(query)
+            )
+        ).order_by(
+            func.similarity(Team.team_name, query).desc(),
+            Team.team_name
+        ).limit(limit).all()
+    
     def update(self, team_id: str, team_data: TeamUpdate) -> Optional[Team]:
         team = self.get_by_id(team_id)
         if team:
@@ -33,6 +57,7 @@ class TeamRepository:
             for field, value in update_data.items():
                 setattr(team, field, value)
             self.db.commit()
+            roster_version.bump()
             self.db.refresh(team)
         return team
     
@@ -45,7 +70,11 @@ class TeamRepository:
             ).update({Participant.team_id: None})
             
             self.db.delete(team)
+            self.db.add(RosterDeletion(entity_type="team", entity_id=team.team_id))
             self.db.commit()
+            roster_version.bump()
+            skill_index.disband_team(team_id)
+            counter_store.team_deleted(team_id)
             return True
         return False
     
@@ -72,7 +101,11 @@ class TeamRepository:
             return False
         
         participant.team_id = team_id
+        self._touch(team_id)
         self.db.commit()
+        roster_version.bump()
+        skill_index.set_team(participant_id, team_id)
+        counter_store.member_moved(None, team_id)
         return True
     
     def remove_member(self, team_id: str, participant_id: str) -> bool:
@@ -88,9 +121,20 @@ class TeamRepository:
             return False
         
         participant.team_id = None
+        self._touch(team_id)
         self.db.commit()
+        roster_version.bump()
+        skill_index.set_team(participant_id, None)
+        counter_store.member_moved(team_id, None)
         return True
     
+    def _touch(self, team_id: str) -> None:
+        """Bump a team's change_seq when its membership changes"""
+        self.db.query(Team).filter(Team.team_id == team_id).update(
+            {Team.change_seq: func.roster_next_change_seq()},
+            synchronize_session=False
+        )
+    
     def transfer_leadership(self, team_id: str, new_leader_id: str) -> bool:
         """Transfer team leadership to another member"""
         team = self.get_by_id(team_id)
@@ -106,8 +150,29 @@ class TeamRepository:
         
         team.leader_id = new_leader_id
         self.db.commit()
+        roster_version.bump()
         return True
     
+    def get_changed_since(self, since: int, limit: int) -> List[Team]:
+        """Get teams inserted, updated or re-membered after the given change cursor"""
+        return self.db.query(Team).options(selectinload(Team.members)).filter(
+            Team.change_seq > since
+        ).order_by(Team.change_seq).limit(limit).all()
+    
+    def get_deleted_since(self, since: int, limit: int) -> List[RosterDeletion]:
+        """Get tombstones of teams deleted after the given change cursor"""
+        return self.db.query(RosterDeletion).filter(
+            RosterDeletion.entity_type == "team",
+            RosterDeletion.change_seq > since
+        ).order_by(RosterDeletion.change_seq).limit(limit).all()
+    
+    def get_lock_states(self, since: Optional[int] = None) -> list:
+        """Get (team_id, is_locked) rows, optionally only for teams changed after a cursor"""
+        query = self.db.query(Team.team_id, Team.is_locked)
+        if since is not None:
+            query = query.filter(Team.change_seq > since)
+        return query.all()
+    
     def get_team_size(self, team_id: str) -> int:
         """Get current number of members in a team"""
         return self.db.query(Participant).filter(
@@ -149,6 +214,117 @@ class TeamRepository:
             )
         ).all()
     
+    def get_open_team_profiles(
+        self,
+        exclude_team_id: Optional[str] = None,
+        include_locked_teams: bool = False,
+        max_team_size: Optional[int] = None
+    ) -> list:
+        """Get teams open to requests that still have free slots, in one query.
+        
+        Each row carries the Team plus member_count, open_slots (max_members minus
+        members) and member_skills (distinct skills across all members).
+        """
+        skill = func.json_array_elements_text(Participant.skills).table_valued("value").lateral()
+        member_count = func.count(distinct(Participant.participant_id))
+        capacity = case(
+            (Team.max_members.op("~")("^[0-9]+$"), cast(Team.max_members, Integer)),
+            else_=4
+        )
+        
+        query = self.db.query(
+            Team,
+            member_count.label("member_count"),
+            (capacity - member_count).label("open_slots"),
+            func.array_agg(distinct(skill.c.value)).filter(skill.c.value.isnot(None)).label("member_skills")
+        ).outerjoin(
+            Participant, Participant.team_id == Team.team_id
+        ).outerjoin(
+            skill, true()
+        ).filter(Team.is_open_to_requests == True)
+        
+        if not include_locked_teams:
+            query = query.filter(Team.is_locked == False)
+        if exclude_team_id:
+            query = query.filter(Team.team_id != exclude_team_id)
+        
+        query = query.group_by(Team.team_id).having(member_count < capacity)
+        if max_team_size is not None:
+            query = query.having(member_count < max_team_size)
+        return query.all()
+    
+    def get_names_with_prefix(self, prefix: str) -> List[str]:
+        return [row.team_name for row in self.db.query(Team.team_name).filter(
+            Team.team_name.like(f"{escape_like(prefix)}%", escape="\\")
+        ).all()]
+    
+    def apply_formation(self, new_teams: List[dict], assignments: Dict[str, str], expected_member_counts: Dict[str, int]) -> bool:
+        """Create teams and set participants' team_id in one transaction.
+        
+        The participants must all still be unassigned and each existing team must still
+        have the expected member count; otherwise nothing is written and False is returned.
+        """
+        participant_ids = list(assignments)
+        try:
+            still_free = self.db.query(Participant.participant_id).filter(
+                Participant.participant_id.in_(participant_ids),
+                Participant.team_id.is_(None)
+            ).with_for_update().all()
+            if len(still_free) != len(participant_ids):
+                self.db.rollback()
+                return False
+            
+            if expected_member_counts:
+                self.db.query(Team.team_id).filter(
+                    Team.team_id.in_(list(expected_member_counts))
+                ).with_for_update().all()
+                current_counts = dict(self.db.query(Participant.team_id, func.count()).filter(
+                    Participant.team_id.in_(list(expected_member_counts))
+                ).group_by(Participant.team_id).all())
+                if any(current_counts.get(team_id, 0) != count for team_id, count in expected_member_counts.items()):
+                    self.db.rollback()
+                    return False
+            
+            if new_teams:
+                self.db.execute(insert(Team), new_teams)
+            participants = Participant.__table__
+            self.db.execute(
+                participants.update().where(
+                    participants.c.participant_id == bindparam("assigned_participant_id")
+                ).values(team_id=bindparam("assigned_team_id")),
+                [
+                    {"assigned_participant_id": participant_id, "assigned_team_id": team_id}
+                    for participant_id, team_id in assignments.items()
+                ]
+            )
+            filled_teams = set(assignments.values()) & set(expected_member_counts)
+            if filled_teams:
+                self.db.query(Team).filter(Team.team_id.in_(list(filled_teams))).update(
+                    {Team.change_seq: func.roster_next_change_seq()},
+                    synchronize_session=False
+                )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        roster_version.bump()
+        for participant_id, team_id in assignments.items():
+            skill_index.set_team(participant_id, team_id)
+        for team in new_teams:
+            counter_store.team_created(team["team_id"])
+        for team_id, count in Counter(assignments.values()).items():
+            counter_store.member_moved(None, team_id, count)
+        return True
+    
+    def get_by_ids_with_members(self, team_ids: List[str]) -> List[Team]:
+        """Get teams with their members eagerly loaded (two queries in total)"""
+        if not team_ids:
+            return []
+        return self.db.query(Team).options(selectinload(Team.members)).filter(
+            Team.team_id.in_(team_ids)
+        ).all()
+    
     def get_team_with_members(self, team_id: str) -> Optional[Team]:
         """Get team with all its members loaded"""
         team = self.get_by_id(team_id)
@@ -159,6 +335,20 @@ class TeamRepository:
             ).all()
         return team
     
+    def get_size_counts(self, full_size: int = 4) -> Dict[str, int]:
+        """Get total, full and empty team counts in one aggregate query"""
+        members = self.db.query(
+            Participant.team_id.label("team_id"),
+            func.count().label("member_count")
+        ).filter(Participant.team_id.isnot(None)).group_by(Participant.team_id).subquery()
+        member_count = func.coalesce(members.c.member_count, 0)
+        total, full, empty = self.db.query(
+            func.count(Team.team_id),
+            func.count(Team.team_id).filter(member_count == full_size),
+            func.count(Team.team_id).filter(member_count == 0)
+        ).outerjoin(members, members.c.team_id == Team.team_id).one()
+        return {"total_teams": total, "full_teams": full, "empty_teams": empty}
+    
     def count_all(self) -> int:
         """Get total count of all teams"""
         return self.db.query(Team).count()
@@ -169,6 +359,8 @@ class TeamRepository:
         if team and team.leader_id == leader_id:
             team.is_locked = is_locked
             self.db.commit()
+            roster_version.bump()
+            skill_index.set_team_locked(team_id, is_locked)
             return True
         return False
     
@@ -178,5 +370,6 @@ class TeamRepository:
         if team and team.leader_id == leader_id:
             team.is_open_to_requests = is_open
             self.db.commit()
+            roster_version.bump()
             return True
         return False
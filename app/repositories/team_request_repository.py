@@ -1,6 +1,8 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, case, delete, or_, tuple_, update
+from sqlalchemy.orm import Session, joinedload
+from typing import Dict, List, Optional, Tuple
 from app.models.team_request import TeamRequest
+from app.repositories.counter_store import counter_store
 from datetime import datetime
 
 class TeamRequestRepository:
@@ -18,6 +20,7 @@ class TeamRequestRepository:
         self.db.add(request)
         self.db.commit()
         self.db.refresh(request)
+        counter_store.requests_opened()
         return request
     
     def get_by_id(self, request_id: str) -> Optional[TeamRequest]:
@@ -32,36 +35,83 @@ class TeamRequestRepository:
             TeamRequest.status == "pending"
         ).first()
     
-    def get_incoming_requests(self, participant_id: str) -> List[TeamRequest]:
-        """Get all incoming requests for a participant"""
-        return self.db.query(TeamRequest).filter(
-            TeamRequest.to_participant_id == participant_id
-        ).order_by(TeamRequest.created_at.desc()).all()
+    def get_incoming_requests(self, participant_id: str, limit: Optional[int] = None, before: Optional[Tuple[datetime, str]] = None) -> List[TeamRequest]:
+        """Get incoming requests for a participant, newest first (optionally one keyset page)"""
+        return self._list_requests(TeamRequest.to_participant_id == participant_id, limit, before)
     
-    def get_outgoing_requests(self, participant_id: str) -> List[TeamRequest]:
-        """Get all outgoing requests from a participant"""
-        return self.db.query(TeamRequest).filter(
-            TeamRequest.from_participant_id == participant_id
-        ).order_by(TeamRequest.created_at.desc()).all()
+    def count_pending_incoming(self, participant_id: str) -> int:
+        """Number of pending requests addressed to a participant (index-only COUNT)"""
+        return self.db.query(func.count()).select_from(TeamRequest).filter(
+            TeamRequest.to_participant_id == participant_id,
+            TeamRequest.status == "pending"
+        ).scalar()
+    
+    def get_status_counts(self, participant_id: str) -> Dict[str, Dict[str, int]]:
+        """Count a participant's incoming and outgoing requests by status, in one GROUP BY query"""
+        direction = case(
+            (TeamRequest.to_participant_id == participant_id, "incoming"),
+            else_="outgoing"
+        ).label("direction")
+        rows = self.db.query(direction, TeamRequest.status, func.count()).filter(
+            or_(
+                TeamRequest.to_participant_id == participant_id,
+                TeamRequest.from_participant_id == participant_id
+            )
+        ).group_by(direction, TeamRequest.status).all()
+        
+        counts = {"incoming": {}, "outgoing": {}}
+        for row_direction, status, count in rows:
+            counts[row_direction][status] = count
+        return counts
+    
+    def get_outgoing_requests(self, participant_id: str, limit: Optional[int] = None, before: Optional[Tuple[datetime, str]] = None) -> List[TeamRequest]:
+        """Get outgoing requests from a participant, newest first (optionally one keyset page)"""
+        return self._list_requests(TeamRequest.from_participant_id == participant_id, limit, before)
+    
+    def _list_requests(self, condition, limit: Optional[int], before: Optional[Tuple[datetime, str]]) -> List[TeamRequest]:
+        # Both participants are joined in, so serialising the rows triggers no lazy loads
+        query = self.db.query(TeamRequest).options(
+            joinedload(TeamRequest.from_participant),
+            joinedload(TeamRequest.to_participant)
+        ).filter(condition)
+        if before is not None:
+            # Keyset: rows strictly after the (created_at, request_id) of the previous page's last row
+            query = query.filter(tuple_(TeamRequest.created_at, TeamRequest.request_id) < tuple_(*before))
+        query = query.order_by(TeamRequest.created_at.desc(), TeamRequest.request_id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
     
     def update_status(self, request_id: str, status: str, responded_at: datetime) -> bool:
-        """Update request status and response time"""
-        request = self.get_by_id(request_id)
-        if request:
-            request.status = status
-            request.responded_at = responded_at
-            self.db.commit()
-            return True
-        return False
+        """Close a pending request; False if it is no longer pending (answered, cancelled or expired meanwhile)"""
+        # Conditional UPDATE: of two concurrent closers (a response, the expiry sweep) only one matches
+        closed = self.db.execute(
+            update(TeamRequest)
+            .where(TeamRequest.request_id == request_id, TeamRequest.status == "pending")
+            .values(status=status, responded_at=responded_at)
+            .returning(TeamRequest.request_id)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        self.db.commit()
+        if closed is None:
+            return False
+        counter_store.requests_closed()
+        return True
     
-    def delete(self, request_id: str) -> bool:
-        """Delete a team request"""
-        request = self.get_by_id(request_id)
-        if request:
-            self.db.delete(request)
-            self.db.commit()
-            return True
-        return False
+    def delete(self, request_id: str, pending_only: bool = False) -> bool:
+        """Delete a team request (with pending_only, only while it is still pending)"""
+        query = delete(TeamRequest).where(TeamRequest.request_id == request_id)
+        if pending_only:
+            query = query.where(TeamRequest.status == "pending")
+        row = self.db.execute(
+            query.returning(TeamRequest.status, TeamRequest.to_participant_id).execution_options(synchronize_session=False)
+        ).first()
+        self.db.commit()
+        if row is None:
+            return False
+        if row.status == "pending":
+            counter_store.requests_closed()
+        return True
     
     def get_pending_requests_for_team(self, team_id: str) -> List[TeamRequest]:
         """Get all pending requests for a specific team"""
@@ -70,19 +120,37 @@ class TeamRequestRepository:
             TeamRequest.status == "pending"
         ).all()
     
-    def cleanup_expired_requests(self, days: int = 7) -> int:
-        """Clean up requests older than specified days"""
+    def expire_pending_batch(self, cutoff: datetime, batch_size: int) -> List[Tuple[str, str, str]]:
+        """Expire up to batch_size requests still pending since before cutoff, oldest first.
+
+        One UPDATE ... WHERE request_id IN (SELECT ... FOR UPDATE SKIP LOCKED): rows a
+        concurrent update_status is writing are left for the next batch instead of waited
+        on, and a response that loses the race finds the row no longer pending.
+        Returns (request_id, from_participant_id, to_participant_id) of the expired rows.
+        """
+        stale = self.db.query(TeamRequest.request_id).filter(
+            TeamRequest.status == "pending",
+            TeamRequest.created_at < cutoff
+        ).order_by(TeamRequest.created_at).limit(batch_size).with_for_update(skip_locked=True)
+        rows = self.db.execute(
+            update(TeamRequest)
+            .where(TeamRequest.request_id.in_(stale.scalar_subquery()))
+            .values(status="expired")
+            .returning(TeamRequest.request_id, TeamRequest.from_participant_id, TeamRequest.to_participant_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        self.db.commit()
+        counter_store.requests_closed(len(rows))
+        return [tuple(row) for row in rows]
+    
+    def cleanup_expired_requests(self, days: int = 7, batch_size: int = 1000) -> int:
+        """Expire requests left pending for more than the specified days, in batches"""
         from datetime import timedelta
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        expired_requests = self.db.query(TeamRequest).filter(
-            TeamRequest.created_at < cutoff_date,
-            TeamRequest.status == "pending"
-        ).all()
-        
-        count = len(expired_requests)
-        for request in expired_requests:
-            request.status = "expired"
-        
-        self.db.commit()
-        return count
+        count = 0
+        while True:
+            expired = self.expire_pending_batch(cutoff_date, batch_size)
+            count += len(expired)
+            if len(expired) < batch_size:
+                return count
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
+from app.core.cache import cache_stats
+from app.repositories.counter_store import counter_store
 from app.services.participant_service import ParticipantService
 from app.services.team_service import TeamService
 from app.services.suggestion_service import SuggestionService
+from app.services.recommendation_service import RecommendationService
+from app.services.auto_assign_service import AutoAssignService
+from app.services.job_service import JobService
+from app.services.overview_service import OverviewService
+from app.services.scoring_profile import get_scoring_profile, reload_scoring_profile
 from app.schemas.participant import ParticipantResponse
 from app.schemas.team import TeamResponse
+from app.schemas.job import JobResponse
 
 router = APIRouter()
 
@@ -61,58 +71,135 @@ async def get_auto_team_suggestions(
 
 @router.post("/auto-assign-teams")
 async def auto_assign_teams(
+    team_size: int = Query(4, ge=2, le=10),
+    seed: int = Query(0),
+    time_budget: float = Query(None, gt=0, le=60),
+    workers: int = Query(None, ge=1, le=32),
     db: Session = Depends(get_db)
 ):
-    """Automatically assign participants to teams based on diversity"""
-    # This is a placeholder for the auto-assignment logic
-    # In a real implementation, this would use the suggestion service
-    # to create balanced teams
-    
-    suggestion_service = SuggestionService(db)
-    suggestions = suggestion_service.get_auto_team_suggestions()
+    """Automatically assign all unassigned participants to teams, maximizing skill coverage"""
+    service = AutoAssignService(db)
+    # The search runs for up to time_budget seconds; keep it off the event loop
+    return await run_in_threadpool(service.auto_assign, team_size=team_size, seed=seed, time_budget=time_budget, workers=workers)
+
+@router.post("/auto-assign-teams/simulate", response_model=JobResponse, status_code=202)
+async def simulate_auto_assign(
+    team_size: int = Query(4, ge=2, le=10),
+    seed: int = Query(0),
+    max_iterations: int = Query(None, ge=0, le=10_000_000),
+    workers: int = Query(None, ge=1, le=32),
+    fill_open_teams: bool = Query(True),
+    exclude_participant_ids: List[str] = Body(None, embed=True),
+    db: Session = Depends(get_db)
+):
+    """Preview auto-assignment without writing anything; poll the returned job for the proposal"""
+    service = JobService(db)
+    return service.submit("simulate", {
+        "team_size": team_size,
+        "seed": seed,
+        "max_iterations": max_iterations,
+        "workers": workers,
+        "fill_open_teams": fill_open_teams,
+        "exclude_participant_ids": exclude_participant_ids or []
+    })
+
+@router.get("/system-overview")
+async def get_system_overview():
+    """Get comprehensive system overview"""
+    service = OverviewService()
+    return await run_in_threadpool(service.get_system_overview)
+
+@router.get("/counters")
+async def get_live_counters():
+    """Get live dashboard totals from memory (no database queries)"""
+    return counter_store.snapshot()
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Get size and hit-rate statistics for the in-process caches"""
+    return cache_stats()
+
+@router.post("/recommendations/compute")
+async def compute_recommendations(
+    k: int = Query(None, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Compute top-k teammate recommendations for every unassigned participant and store them"""
+    service = RecommendationService(db)
+    return await run_in_threadpool(service.compute_all, k)
+
+@router.get("/recommendations/export")
+async def export_recommendations():
+    """Stream the stored recommendations as NDJSON (one participant per line)"""
+    def lines():
+        db = SessionLocal()
+        try:
+            yield from RecommendationService(db).export_lines()
+        finally:
+            db.close()
     
-    if suggestions["total_participants"] < 4:
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/scoring-profile")
+async def get_scoring_profile_config():
+    """Get the active compatibility scoring profile"""
+    profile = get_scoring_profile()
+    return {"version": profile.version, "profile": profile.config}
+
+@router.post("/scoring-profile/reload")
+async def reload_scoring_profile_config():
+    """Re-read the scoring profile from SCORING_PROFILE_PATH without restarting"""
+    try:
+        profile = reload_scoring_profile()
+    except (OSError, ValueError, KeyError, TypeError) as e:
         raise HTTPException(
             status_code=400,
-            detail="Not enough participants to form teams"
+            detail=f"Invalid scoring profile: {e}"
         )
-    
-    # For now, return the suggestions
-    # TODO: Implement actual auto-assignment algorithm
-    return {
-        "message": "Auto-assignment suggestions generated",
-        "suggestions": suggestions,
-        "note": "Actual auto-assignment not yet implemented"
-    }
+    return {"version": profile.version, "profile": profile.config}
 
-@router.get("/system-overview")
-async def get_system_overview(
+@router.get("/jobs", response_model=List[JobResponse])
+async def get_jobs(
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
-    """Get comprehensive system overview"""
-    participant_service = ParticipantService(db)
-    team_service = TeamService(db)
-    suggestion_service = SuggestionService(db)
-    
-    # Get all statistics
-    total_participants = len(participant_service.get_all_participants())
-    unassigned_participants = len(participant_service.get_unassigned_participants())
-    total_teams = len(team_service.get_all_teams())
-    cluster_distribution = participant_service.get_cluster_distribution()
-    team_stats = team_service.get_team_statistics()
-    auto_suggestions = suggestion_service.get_auto_team_suggestions()
-    
-    return {
-        "participants": {
-            "total": total_participants,
-            "unassigned": unassigned_participants,
-            "assigned": total_participants - unassigned_participants,
-            "cluster_distribution": cluster_distribution
-        },
-        "teams": {
-            "total": total_teams,
-            "statistics": team_stats
-        },
-        "auto_assignment": auto_suggestions,
-        "system_status": "operational"
-    }
+    """Get the most recent background jobs"""
+    service = JobService(db)
+    return service.get_recent_jobs(limit)
+
+@router.post("/jobs/{kind}", response_model=JobResponse, status_code=202)
+async def submit_job(
+    kind: str,
+    params: Optional[dict] = Body(None),
+    db: Session = Depends(get_db)
+):
+    """Start a background job (auto_assign, simulate, recommendations) and return immediately"""
+    service = JobService(db)
+    return service.submit(kind, params)
+
+@router.get("/jobs/{job_id}/status", response_model=JobResponse)
+async def get_job_status(
+    job_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Get a background job's status and progress"""
+    service = JobService(db)
+    return service.get_job(str(job_id))
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Get the result of a finished background job"""
+    service = JobService(db)
+    return service.get_result(str(job_id))
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Cancel a queued job, or ask a running one to stop"""
+    service = JobService(db)
+    return service.cancel(str(job_id))
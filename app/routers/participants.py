@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
 from app.core.database import get_db
 from app.services.participant_service import ParticipantService
 from app.services.suggestion_service import SuggestionService
-from app.schemas.participant import ParticipantCreate, ParticipantResponse, ParticipantUpdate
+from app.schemas.participant import ParticipantCreate, ParticipantResponse, ParticipantUpdate, ParticipantChanges
 from app.schemas.suggestion import SuggestionResponse
 
 router = APIRouter()
@@ -51,6 +51,16 @@ async def check_usn_exists(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+@router.get("/search", response_model=List[ParticipantResponse])
+async def search_participants(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(None, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Search participants by partial name or USN (typeahead)"""
+    service = ParticipantService(db)
+    return service.search_participants(q, limit)
+
 @router.get("/{participant_id}", response_model=ParticipantResponse)
 async def get_participant(
     participant_id: UUID,
@@ -95,6 +105,16 @@ async def get_unassigned_participants(
     service = ParticipantService(db)
     return service.get_unassigned_participants()
 
+@router.get("/unassigned/changes", response_model=ParticipantChanges)
+async def get_unassigned_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Get unassigned-list changes since a cursor (pass since=0 for a full sync)"""
+    service = ParticipantService(db)
+    return service.get_unassigned_changes(since, limit)
+
 @router.get("/skill/{skill}", response_model=List[ParticipantResponse])
 async def get_participants_by_skill(
     skill: str,
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
+from app.core.events import event_broker
 from app.services.discovery_service import DiscoveryService
 from app.services.team_request_service import TeamRequestService
 from app.services.team_service import TeamService
@@ -20,6 +23,7 @@ async def discover_teammates(
     department: str = None,
     year: int = None,
     max_team_size: str = None,
+    skills: List[str] = Query(None),
     include_locked_teams: bool = False,
     db: Session = Depends(get_db)
 ):
@@ -31,6 +35,7 @@ async def discover_teammates(
         department=department,
         year=year,
         max_team_size=max_team_size,
+        skills=skills,
         include_locked_teams=include_locked_teams
     )
     
@@ -60,11 +65,14 @@ async def respond_to_request(
 @router.get("/requests/{participant_id}")
 async def get_user_requests(
     participant_id: str,
+    limit: int = Query(None, ge=1, le=200),
+    incoming_cursor: str = None,
+    outgoing_cursor: str = None,
     db: Session = Depends(get_db)
 ):
-    """Get all requests for a participant"""
+    """Get requests for a participant (all of them, or one page per direction with limit)"""
     service = TeamRequestService(db)
-    return service.get_user_requests(participant_id)
+    return service.get_user_requests(participant_id, limit, incoming_cursor, outgoing_cursor)
 
 @router.delete("/cancel-request/{request_id}/{from_participant_id}")
 async def cancel_request(
@@ -116,6 +124,34 @@ async def get_notifications(
     service = NotificationService(db)
     return service.get_request_summary(participant_id)
 
+@router.get("/events/{participant_id}")
+async def stream_events(
+    participant_id: str,
+    request: Request
+):
+    """Server-Sent Events stream of a participant's team-request notifications"""
+    async def event_stream():
+        # Tell the browser how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        events = event_broker.stream(participant_id)
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        finally:
+            # Unsubscribe right away instead of whenever the generator is collected
+            await events.aclose()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/unread-count/{participant_id}")
 async def get_unread_count(
     participant_id: str,
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from typing import Union
 from app.core.database import get_db
 from app.services.team_service import TeamService
 from app.services.participant_service import ParticipantService
-from app.schemas.team import TeamCreate, TeamResponse, TeamUpdate, TeamJoin
+from app.services.suggestion_service import SuggestionService
+from app.schemas.team import TeamCreate, TeamResponse, TeamUpdate, TeamJoin, TeamSearchResult, TeamChanges
+from app.schemas.suggestion import TeamGapFillResponse
 from app.schemas.auth import TeamCreationRequest
 
 router = APIRouter()
@@ -51,6 +53,37 @@ async def create_team(
     service = TeamService(db)
     return service.create_team(team_data)
 
+@router.get("/search", response_model=List[TeamSearchResult])
+async def search_teams(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: int = Query(None, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Search teams by partial name (typeahead)"""
+    service = TeamService(db)
+    return service.search_teams(q, limit)
+
+@router.get("/changes", response_model=TeamChanges)
+async def get_team_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    open_only: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Get team-list changes since a cursor (pass since=0 for a full sync)"""
+    service = TeamService(db)
+    return service.get_team_changes(since, limit, open_only)
+
+@router.get("/{team_id}/gap-fill", response_model=TeamGapFillResponse)
+async def get_team_gap_fill(
+    team_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Get unassigned participants ranked by the new skills they would bring to the team"""
+    service = SuggestionService(db)
+    return service.get_team_gap_fill(team_id, limit)
+
 @router.get("/{team_id}", response_model=TeamResponse)
 async def get_team(
     team_id: str,
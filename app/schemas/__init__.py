@@ -1,15 +1,17 @@
-from .participant import ParticipantCreate, ParticipantResponse, ParticipantUpdate
-from .team import TeamCreate, TeamResponse, TeamUpdate, TeamLock
-from .suggestion import TeammateSuggestion
+from .participant import ParticipantCreate, ParticipantResponse, ParticipantUpdate, ParticipantChanges
+from .team import TeamCreate, TeamResponse, TeamUpdate, TeamLock, TeamSearchResult, TeamChanges
+from .suggestion import TeammateSuggestion, GapFillCandidate, TeamGapFillResponse
 from .auth import LoginRequest, LoginResponse, TeamCreationRequest
 from .team_request import TeamRequestCreate, TeamRequestResponse, TeamRequestUpdate, TeamRequestList
+from .job import JobResponse
 from .discovery import TeammateSuggestion as DiscoveryTeammateSuggestion, TeamDiscovery, DiscoveryFilters, DiscoveryResponse
 
 __all__ = [
-    "ParticipantCreate", "ParticipantResponse", "ParticipantUpdate",
-    "TeamCreate", "TeamResponse", "TeamUpdate", "TeamLock",
-    "TeammateSuggestion",
+    "ParticipantCreate", "ParticipantResponse", "ParticipantUpdate", "ParticipantChanges",
+    "TeamCreate", "TeamResponse", "TeamUpdate", "TeamLock", "TeamSearchResult", "TeamChanges",
+    "TeammateSuggestion", "GapFillCandidate", "TeamGapFillResponse",
     "LoginRequest", "LoginResponse", "TeamCreationRequest",
     "TeamRequestCreate", "TeamRequestResponse", "TeamRequestUpdate", "TeamRequestList",
-    "DiscoveryTeammateSuggestion", "TeamDiscovery", "DiscoveryFilters", "DiscoveryResponse"
+    "DiscoveryTeammateSuggestion", "TeamDiscovery", "DiscoveryFilters", "DiscoveryResponse",
+    "JobResponse"
 ]
@@ -7,9 +7,8 @@ class TeammateSuggestion(BaseModel):
     participant: ParticipantResponse
     compatibility_score: int
     reasons: List[str]  # Why they're a good match
-    department_diversity: bool
-    year_diversity: bool
-    interest_complement: bool
+    skill_diversity: int  # New skills they bring
+    skill_overlap: int  # Skills shared with the requester
 
 class TeamDiscovery(BaseModel):
     team: TeamResponse
@@ -18,10 +17,12 @@ class TeamDiscovery(BaseModel):
     reasons: List[str]
 
 class DiscoveryFilters(BaseModel):
+    # Legacy filters: participants no longer record a cluster, department or year, so these are ignored
     interest_cluster: Optional[int] = None
     department: Optional[str] = None
     year: Optional[int] = None
     max_team_size: Optional[str] = None
+    skills: Optional[List[str]] = None
     include_locked_teams: bool = False
 
 class DiscoveryResponse(BaseModel):
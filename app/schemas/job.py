@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Any, Dict, List
+from datetime import datetime
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    params: Optional[Dict[str, Any]] = None
+    progress: float = 0.0
+    message: Optional[str] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+# Parameters accepted by POST /jobs/{kind}, with the same bounds as the synchronous endpoints
+
+class AutoAssignJobParams(BaseModel):
+    team_size: int = Field(4, ge=2, le=10)
+    seed: int = 0
+    time_budget: Optional[float] = Field(None, gt=0, le=60)
+    workers: Optional[int] = Field(None, ge=1, le=32)
+    
+    class Config:
+        extra = "forbid"
+
+class SimulateJobParams(BaseModel):
+    team_size: int = Field(4, ge=2, le=10)
+    seed: int = 0
+    max_iterations: Optional[int] = Field(None, ge=0, le=10_000_000)
+    workers: Optional[int] = Field(None, ge=1, le=32)
+    fill_open_teams: bool = True
+    exclude_participant_ids: List[str] = []
+    
+    class Config:
+        extra = "forbid"
+
+class RecommendationsJobParams(BaseModel):
+    k: Optional[int] = Field(None, ge=1, le=100)
+    
+    class Config:
+        extra = "forbid"
@@ -31,6 +31,12 @@ class ParticipantResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ParticipantChanges(BaseModel):
+    cursor: int
+    has_more: bool
+    upserted: List[ParticipantResponse]
+    removed: List[UUID]
+
 class ParticipantLogin(BaseModel):
     email: EmailStr
     password: str
@@ -8,6 +8,20 @@ class TeammateSuggestion(BaseModel):
     match_score: float
     reason: str
 
+class GapFillCandidate(BaseModel):
+    participant: ParticipantResponse
+    new_skills: List[str]
+    coverage_after: int
+
+class TeamGapFillResponse(BaseModel):
+    team_id: str
+    team_size: int
+    open_slots: int
+    team_skills: List[str]
+    missing_skills: List[str]
+    candidates: List[GapFillCandidate]
+    total_found: int
+
 class SuggestionRequest(BaseModel):
     participant_id: UUID
     max_suggestions: int = 5
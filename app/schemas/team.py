@@ -32,6 +32,24 @@ class TeamResponse(TeamBase):
     class Config:
         from_attributes = True
 
+class TeamChanges(BaseModel):
+    cursor: int
+    has_more: bool
+    upserted: List[TeamResponse]
+    removed: List[str]
+
+class TeamSearchResult(BaseModel):
+    team_id: str
+    team_name: str
+    leader_id: str
+    is_locked: bool = False
+    is_open_to_requests: bool = True
+    max_members: Optional[str] = "4"
+    member_count: int = 0
+
+    class Config:
+        from_attributes = True
+
 class TeamJoin(BaseModel):
     team_id: str
     participant_id: str
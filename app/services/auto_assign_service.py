@@ -0,0 +1,251 @@
+import re
+import threading
+import uuid
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from app.repositories.participant_repository import ParticipantRepository
+from app.repositories.team_repository import TeamRepository
+from app.services.team_formation_engine import PoolParticipant, PoolTeam, ProposedTeam, FormationResult, form_teams, formation_metrics
+from app.core.config import settings
+from app.core.roster import roster_version
+from fastapi import HTTPException
+
+AUTO_TEAM_PREFIX = "Auto Team "
+
+class FormationPlan(NamedTuple):
+    result: FormationResult
+    participants: List[PoolParticipant]
+    open_teams: List[PoolTeam]
+    team_size: int
+
+class RosterSnapshot(NamedTuple):
+    """Engine input frozen at one roster version, reused by simulations until the roster changes"""
+    version: int
+    participants: List[PoolParticipant]
+    open_teams: List[PoolTeam]
+    team_names: Dict[str, str]
+
+_snapshot_lock = threading.Lock()
+_snapshot: Optional[RosterSnapshot] = None
+
+class AutoAssignService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.participant_repository = ParticipantRepository(db)
+        self.team_repository = TeamRepository(db)
+    
+    def snapshot(self) -> Tuple[List[PoolParticipant], List[PoolTeam]]:
+        """Unassigned participants and open teams with free slots, as engine input"""
+        snapshot = self._load_snapshot()
+        return snapshot.participants, snapshot.open_teams
+    
+    def cached_snapshot(self) -> RosterSnapshot:
+        """The in-memory snapshot for the current roster version, loading it if the roster moved"""
+        global _snapshot
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot.version != roster_version.value:
+                _snapshot = self._load_snapshot()
+            return _snapshot
+    
+    def _load_snapshot(self) -> RosterSnapshot:
+        # Read the version first: a write landing mid-load makes the snapshot stale, never fresh
+        version = roster_version.value
+        participants = [
+            PoolParticipant(row.participant_id, frozenset(row.skills or ()))
+            for row in self.participant_repository.get_unassigned_skill_rows()
+        ]
+        profiles = self.team_repository.get_open_team_profiles()
+        open_teams = [
+            PoolTeam(
+                team_id=profile.Team.team_id,
+                member_count=profile.member_count,
+                capacity=profile.member_count + profile.open_slots,
+                member_skills=frozenset(profile.member_skills or ())
+            )
+            for profile in profiles
+        ]
+        team_names = {profile.Team.team_id: profile.Team.team_name for profile in profiles}
+        return RosterSnapshot(version, participants, open_teams, team_names)
+    
+    def simulate(
+        self,
+        team_size: int = 4,
+        seed: int = 0,
+        max_iterations: Optional[int] = None,
+        workers: Optional[int] = None,
+        fill_open_teams: bool = True,
+        exclude_participant_ids: Iterable[str] = (),
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> dict:
+        """Dry-run the formation engine over the in-memory snapshot and diff it against the roster.
+        
+        Nothing is written. The search is bounded by max_iterations rather than wall time,
+        so the same snapshot, seed and parameters always give the same proposal.
+        """
+        snapshot = self.cached_snapshot()
+        excluded = set(exclude_participant_ids)
+        participants = [participant for participant in snapshot.participants if participant.participant_id not in excluded]
+        open_teams = snapshot.open_teams if fill_open_teams else []
+        if not participants:
+            raise HTTPException(
+                status_code=400,
+                detail="No unassigned participants to place"
+            )
+        
+        result = form_teams(
+            participants,
+            open_teams,
+            team_size=team_size,
+            seed=seed,
+            time_budget=settings.simulation_time_limit_seconds,
+            max_iterations=max_iterations if max_iterations is not None else settings.simulation_max_iterations,
+            should_stop=should_stop,
+            workers=workers if workers is not None else settings.auto_assign_workers
+        )
+        
+        # Open teams as they stand now, for comparison with the proposal
+        current = formation_metrics([
+            ProposedTeam(team.team_id, team.member_count, [], team.member_skills)
+            for team in snapshot.open_teams
+        ])
+        open_team_of = {team.team_id: team for team in snapshot.open_teams}
+        next_number = self._next_team_number()
+        teams, filled = [], []
+        for proposed in result.teams:
+            if not proposed.new_member_ids:
+                continue
+            if proposed.team_id is None:
+                team_name = f"{AUTO_TEAM_PREFIX}{next_number}"
+                next_number += 1
+            else:
+                team_name = snapshot.team_names.get(proposed.team_id)
+                before = open_team_of[proposed.team_id]
+                filled.append({
+                    "team_id": proposed.team_id,
+                    "team_name": team_name,
+                    "added_member_ids": proposed.new_member_ids,
+                    "size_before": before.member_count,
+                    "size_after": before.member_count + len(proposed.new_member_ids),
+                    "skills_added": sorted(proposed.skills - before.member_skills)
+                })
+            teams.append({
+                "team_id": proposed.team_id,
+                "team_name": team_name,
+                "new_team": proposed.team_id is None,
+                "member_ids": proposed.new_member_ids,
+                "skills": sorted(proposed.skills)
+            })
+        
+        return {
+            "roster_version": snapshot.version,
+            "parameters": {
+                "team_size": team_size,
+                "seed": seed,
+                "max_iterations": max_iterations if max_iterations is not None else settings.simulation_max_iterations,
+                "fill_open_teams": fill_open_teams,
+                "excluded_participants": len(excluded)
+            },
+            "metrics": result.metrics,
+            "current": current,
+            "diff": {
+                "participants_placed": result.metrics["participants_placed"],
+                "participants_left_unassigned": len(snapshot.participants) - result.metrics["participants_placed"],
+                "teams_created": result.metrics["new_teams"],
+                "teams_filled": filled,
+                "open_team_coverage_before": current["skill_coverage"],
+                "open_team_coverage_after": self._open_team_coverage(snapshot.open_teams, result.teams)
+            },
+            "teams": teams
+        }
+    
+    def _open_team_coverage(self, open_teams: Sequence[PoolTeam], proposed_teams: Sequence[ProposedTeam]) -> int:
+        """Skill coverage of the same open teams as "before", with any proposed additions merged in"""
+        proposed_skills = {proposed.team_id: proposed.skills for proposed in proposed_teams if proposed.team_id is not None}
+        return sum(len(team.member_skills | proposed_skills.get(team.team_id, frozenset())) for team in open_teams)
+    
+    def auto_assign(self, team_size: int = 4, seed: int = 0, time_budget: Optional[float] = None, workers: Optional[int] = None) -> dict:
+        """Place every unassigned participant into a team and commit the result in one transaction"""
+        return self.apply(self.plan(team_size, seed, time_budget, workers=workers))
+    
+    def plan(
+        self,
+        team_size: int = 4,
+        seed: int = 0,
+        time_budget: Optional[float] = None,
+        should_stop: Optional[Callable[[], bool]] = None,
+        workers: Optional[int] = None
+    ) -> FormationPlan:
+        """Run the formation engine over a fresh snapshot without writing anything"""
+        participants, open_teams = self.snapshot()
+        if not participants:
+            raise HTTPException(
+                status_code=400,
+                detail="No unassigned participants to place"
+            )
+        
+        result = form_teams(
+            participants,
+            open_teams,
+            team_size=team_size,
+            seed=seed,
+            time_budget=time_budget if time_budget is not None else settings.auto_assign_time_budget_seconds,
+            should_stop=should_stop,
+            workers=workers if workers is not None else settings.auto_assign_workers
+        )
+        return FormationPlan(result, participants, open_teams, team_size)
+    
+    def apply(self, plan: FormationPlan) -> dict:
+        """Create and fill the planned teams in one transaction (409 if the roster moved meanwhile)"""
+        result, participants, open_teams, team_size = plan
+        skills_of = {participant.participant_id: participant.skills for participant in participants}
+        next_number = self._next_team_number()
+        
+        new_teams, assignments, teams = [], {}, []
+        for proposed in result.teams:
+            team_id, team_name = proposed.team_id, None
+            if team_id is None:
+                # Lead with the member bringing the most skills
+                leader_id = min(proposed.new_member_ids, key=lambda pid: (-len(skills_of[pid]), pid))
+                team_id = str(uuid.uuid4())
+                team_name = f"{AUTO_TEAM_PREFIX}{next_number}"
+                next_number += 1
+                new_teams.append({
+                    "team_id": team_id,
+                    "team_name": team_name,
+                    "leader_id": leader_id,
+                    "max_members": str(team_size)
+                })
+            for participant_id in proposed.new_member_ids:
+                assignments[participant_id] = team_id
+            if proposed.new_member_ids:
+                teams.append({
+                    "team_id": team_id,
+                    "team_name": team_name,
+                    "new_team": proposed.team_id is None,
+                    "member_ids": proposed.new_member_ids,
+                    "skills": sorted(proposed.skills)
+                })
+        
+        expected_member_counts = {team.team_id: team.member_count for team in open_teams}
+        if not self.team_repository.apply_formation(new_teams, assignments, expected_member_counts):
+            raise HTTPException(
+                status_code=409,
+                detail="Teams or participants changed while the assignment was computed; please retry"
+            )
+        
+        return {
+            "message": f"Assigned {len(assignments)} participants to {len(teams)} teams",
+            "metrics": result.metrics,
+            "teams": teams
+        }
+    
+    def _next_team_number(self) -> int:
+        numbers = [
+            int(match.group(1))
+            for match in (
+                re.fullmatch(re.escape(AUTO_TEAM_PREFIX) + r"(\d+)", name)
+                for name in self.team_repository.get_names_with_prefix(AUTO_TEAM_PREFIX)
+            )
+            if match
+        ]
+        return max(numbers, default=0) + 1
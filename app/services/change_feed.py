@@ -0,0 +1,18 @@
+from typing import List, Sequence, Tuple
+from app.core.roster import change_horizon
+
+def paginate_changes(changed: Sequence, deleted: Sequence, since: int, limit: int) -> Tuple[List, int, bool]:
+    """Merge changed rows and tombstones into one page ordered by change_seq.
+    
+    Both inputs must be fetched with ``change_seq > since`` and a limit of
+    ``limit + 1`` so that ``has_more`` is exact. The returned cursor never passes
+    the change horizon (see ChangeHorizon): rows above it are still returned, and
+    again on the next read, since a transaction holding a lower change_seq may yet
+    commit. Clients apply pages as upserts and removals, so repeats are harmless.
+    """
+    merged = sorted([*changed, *deleted], key=lambda item: item.change_seq)
+    page = merged[:limit]
+    last = page[-1].change_seq if page else since
+    cursor = max(since, min(last, change_horizon.current()))
+    # Only report more when the cursor reached the page end; otherwise the same page would repeat
+    return page, cursor, len(merged) > limit and cursor == last
@@ -0,0 +1,226 @@
+import bisect
+import threading
+import time
+import numpy as np
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.repositories.skill_index import skill_index
+from app.services.skill_matrix import SkillMatrix, batch_top_k
+from app.services.scoring_profile import ScoringProfile, get_scoring_profile
+
+class NeighborTable:
+    """Best-first top-K (score, participant_id) lists for every row of a SkillMatrix.
+
+    Patched in place by apply(); only participants that changed are re-ranked, and
+    only lists they enter or leave are updated.
+    """
+
+    def __init__(self, k: int, entries: Sequence[Tuple[str, frozenset, bool]], profile: ScoringProfile):
+        self.k = k
+        self.matrix = SkillMatrix([entry[0] for entry in entries], [entry[1] for entry in entries], profile=profile)
+        self.skills: Dict[str, frozenset] = {participant_id: skills for participant_id, skills, _ in entries}
+        self.available = np.array([entry[2] for entry in entries], dtype=bool)
+        # Best-first (score, participant_id) lists and the reverse "who lists me" map
+        self.neighbors: Dict[str, List[Tuple[int, str]]] = {}
+        self.listed_by: Dict[str, Set[str]] = defaultdict(set)
+        # Score of each row's K-th entry, or -1 while its list has free slots
+        self.worst = np.full(len(entries), -1, dtype=np.int32)
+
+        # Rank every owner in blocks of matrix-matrix products
+        ids = self.matrix.participant_ids
+        for owner_row, ranked in batch_top_k(self.matrix, list(range(len(entries))), k, self._eligible()):
+            self._set_neighbors(ids[owner_row], [(score, ids[column]) for score, column in ranked])
+
+    def candidate_count(self, participant_id: str) -> int:
+        """Number of available participants other than the given one"""
+        eligible = self._eligible()
+        row = self.matrix.row_of.get(participant_id)
+        if row is not None:
+            eligible[row] = False
+        return int(eligible.sum())
+
+    def apply(self, changes: Dict[str, Optional[Tuple[frozenset, bool]]]) -> None:
+        """Apply changed participants ({participant_id: (skills, available) or None if deleted})"""
+        for participant_id, entry in changes.items():
+            if entry is None:
+                self._drop(participant_id)
+            else:
+                self._store(participant_id, *entry)
+
+        # Take changed participants out of every list and drop their own lists
+        affected = set(changes)
+        refill = set()
+        for participant_id in affected:
+            for owner in self.listed_by.pop(participant_id, set()):
+                entries = self.neighbors.get(owner)
+                if entries is not None:
+                    entries[:] = [entry for entry in entries if entry[1] != participant_id]
+                    refill.add(owner)
+            self._set_neighbors(participant_id, None)
+
+        eligible = self._eligible()
+        reranked = set()
+        for owner in (affected | refill):
+            if owner in self.matrix.row_of:
+                self._rank(owner, eligible)
+                reranked.add(owner)
+
+        # Offer changed participants to everyone else whose list they now qualify for
+        for participant_id in affected:
+            row = self.matrix.row_of.get(participant_id)
+            if row is not None and eligible[row]:
+                self._offer(participant_id, row, reranked)
+
+    def _store(self, participant_id: str, skills: frozenset, available: bool) -> None:
+        self.skills[participant_id] = skills
+        row = self.matrix.upsert(participant_id, skills)
+        if row >= len(self.worst):
+            grow = row + 1 - len(self.worst)
+            self.worst = np.append(self.worst, np.full(grow, -1, dtype=np.int32))
+            self.available = np.append(self.available, np.zeros(grow, dtype=bool))
+        self.available[row] = available
+
+    def _drop(self, participant_id: str) -> None:
+        self.skills.pop(participant_id, None)
+        row = self.matrix.row_of.get(participant_id)
+        if row is not None:
+            self.worst[row] = -1
+            self.available[row] = False
+        self.matrix.remove(participant_id)
+
+    def _eligible(self) -> np.ndarray:
+        """Rows that can be suggested: active and unassigned or in an unlocked team"""
+        return self.matrix.active & self.available
+
+    def _rank(self, owner: str, eligible: np.ndarray) -> None:
+        row = self.matrix.row_of[owner]
+        eligible = eligible.copy()
+        eligible[row] = False
+        compatibility = self.matrix.score(self.skills[owner])
+        self._set_neighbors(owner, [
+            (int(compatibility.scores[index]), self.matrix.participant_ids[index])
+            for index in compatibility.top(self.k, eligible)
+        ])
+
+    def _offer(self, candidate: str, candidate_row: int, skip: Set[str]) -> None:
+        compatibility = self.matrix.score(self.skills[candidate], as_candidate=True)
+        owners = self.matrix.active & (compatibility.scores >= self.worst)
+        owners[candidate_row] = False
+        for owner_row in np.flatnonzero(owners).tolist():
+            owner = self.matrix.participant_ids[owner_row]
+            if owner in skip:
+                continue
+            entries = self.neighbors.setdefault(owner, [])
+            key = (-int(compatibility.scores[owner_row]), candidate_row)
+            keys = [(-score, self.matrix.row_of[pid]) for score, pid in entries]
+            position = bisect.bisect_left(keys, key)
+            if position >= self.k:
+                continue
+            entries.insert(position, (-key[0], candidate))
+            self.listed_by[candidate].add(owner)
+            if len(entries) > self.k:
+                _, evicted = entries.pop()
+                self.listed_by[evicted].discard(owner)
+            self.worst[owner_row] = entries[-1][0] if len(entries) >= self.k else -1
+
+    def _set_neighbors(self, owner: str, entries: Optional[List[Tuple[int, str]]]) -> None:
+        for _, candidate in self.neighbors.pop(owner, []):
+            self.listed_by[candidate].discard(owner)
+        row = self.matrix.row_of.get(owner)
+        if entries is None:
+            if row is not None:
+                self.worst[row] = -1
+            return
+        self.neighbors[owner] = entries
+        for _, candidate in entries:
+            self.listed_by[candidate].add(owner)
+        if row is not None:
+            self.worst[row] = entries[-1][0] if len(entries) >= self.k else -1
+
+class CompatibilityIndex:
+    """Top-K most compatible available teammates for every participant.
+
+    Derived from the skill index, this worker's one consumer of the roster change
+    feed: a build ranks a snapshot of it, and each read applies the participants it
+    reports changed since (see SkillIndex.changes_since). Builds run outside the
+    lock and swap the new table in, so reads keep being served from the previous
+    table meanwhile; only the first read waits for one. A periodic full rebuild
+    bounds any drift of the incremental patches.
+    """
+
+    def __init__(self, k: int, rebuild_seconds: float):
+        self.k = k
+        self.rebuild_seconds = rebuild_seconds
+        # Guards the current table: reads and incremental patches
+        self._lock = threading.Lock()
+        # One build at a time
+        self._build_lock = threading.Lock()
+        self._table: Optional[NeighborTable] = None
+        self._generation = 0
+        self._built_at = 0.0
+        self._stale = False
+
+    def neighbors(self, db: Session, participant_id: str) -> Optional[List[Tuple[int, str]]]:
+        """Get the participant's top-K (score, participant_id) list, best first"""
+        self.refresh(db)
+        with self._lock:
+            if self._table is None:
+                return None
+            entries = self._table.neighbors.get(str(participant_id))
+            return list(entries) if entries is not None else None
+
+    def candidate_count(self, participant_id: str) -> int:
+        """Number of available participants other than the given one, as of the last refresh"""
+        with self._lock:
+            return self._table.candidate_count(str(participant_id)) if self._table is not None else 0
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next read"""
+        with self._lock:
+            self._stale = True
+
+    def refresh(self, db: Session) -> None:
+        """Catch up with the skill index, patching the table or rebuilding it"""
+        skill_index.refresh(db)
+        with self._lock:
+            table = self._table
+            if (
+                table is not None
+                and not self._stale
+                and time.monotonic() - self._built_at <= self.rebuild_seconds
+                and table.matrix.profile is get_scoring_profile()
+            ):
+                changes = skill_index.changes_since(self._generation)
+                # Large batches are cheaper to recompute from scratch
+                if changes is not None and len(changes[1]) <= max(self.k, len(table.matrix) // 10):
+                    self._generation, changed = changes
+                    if changed:
+                        table.apply(changed)
+                    return
+        self._rebuild(wait=table is None)
+
+    def _rebuild(self, wait: bool) -> None:
+        if not self._build_lock.acquire(blocking=wait):
+            # Another thread is building; keep serving the current table until it swaps
+            return
+        try:
+            with self._lock:
+                if wait and self._table is not None:
+                    return
+            generation, entries = skill_index.snapshot()
+            table = NeighborTable(self.k, entries, get_scoring_profile())
+            with self._lock:
+                # Patches applied to the old table meanwhile are replayed from this generation
+                self._table = table
+                self._generation = generation
+                self._built_at = time.monotonic()
+                self._stale = False
+        finally:
+            self._build_lock.release()
+
+compatibility_index = CompatibilityIndex(
+    k=settings.compatibility_index_k,
+    rebuild_seconds=settings.compatibility_index_rebuild_seconds
+)
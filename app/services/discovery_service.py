@@ -1,159 +1,218 @@
+import numpy as np
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from app.repositories.participant_repository import ParticipantRepository
 from app.repositories.team_repository import TeamRepository
+from app.repositories.skill_index import skill_index
+from app.services.skill_matrix import SkillMatrix, top_indices
+from app.services.compatibility_index import compatibility_index
+from app.services.scoring_profile import get_scoring_profile
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.roster import roster_version
+from fastapi import HTTPException
 from app.schemas.discovery import (
     TeammateSuggestion, 
     TeamDiscovery, 
     DiscoveryFilters,
+    DiscoveryResponse,
     ParticipantResponse,
     TeamResponse
 )
 
+MIN_COMPATIBILITY_SCORE = 5
+MAX_TEAMMATE_SUGGESTIONS = 20
+MAX_TEAM_SUGGESTIONS = 15
+
+# Results per (participant, filters, roster version); entries for old versions age out via LRU
+_discovery_cache = TTLCache(
+    max_entries=settings.discovery_cache_entries,
+    ttl_seconds=settings.discovery_cache_ttl_seconds,
+    name="discovery"
+)
+
 class DiscoveryService:
     def __init__(self, db: Session):
         self.db = db
         self.participant_repository = ParticipantRepository(db)
         self.team_repository = TeamRepository(db)
     
-    def discover_teammates(self, participant_id: UUID, filters: DiscoveryFilters) -> List[TeammateSuggestion]:
-        """Discover potential teammates for a participant"""
-        
+    def discover_teammates(self, participant_id: UUID, filters: DiscoveryFilters) -> DiscoveryResponse:
+        """Discover potential teammates for a participant (cached until the roster or scoring profile changes)"""
+        cache_key = (str(participant_id), filters.json(), roster_version.value, get_scoring_profile().version)
+        return _discovery_cache.get_or_set(
+            cache_key,
+            lambda: self._discover(participant_id, filters)
+        )
+    
+    def _discover(self, participant_id: UUID, filters: DiscoveryFilters) -> DiscoveryResponse:
         current_participant = self.participant_repository.get_by_id(participant_id)
         if not current_participant:
-            return []
-        
-        # Get all available participants
-        available_participants = self.participant_repository.get_available_participants()
-        
-        suggestions = []
-        for participant in available_participants:
-            # Skip self
-            if participant.participant_id == current_participant.participant_id:
-                continue
-            
-            # Calculate compatibility score
-            score, reasons = self._calculate_compatibility(current_participant, participant)
-            
-            # Apply filters
-            if filters.skills and participant.skills:
-                # Check if participant has any of the required skills
-                required_skills = set(filters.skills)
-                participant_skills = set(participant.skills)
-                if not required_skills.intersection(participant_skills):
-                    continue
-            
-            # Check if score meets minimum threshold
-            if score >= 5:  # Minimum compatibility score
-                suggestion = TeammateSuggestion(
-                    participant=ParticipantResponse.from_orm(participant),
-                    compatibility_score=score,
-                    reasons=reasons,
-                    skill_diversity=self._calculate_skill_diversity(current_participant, participant),
-                    skill_overlap=self._calculate_skill_overlap(current_participant, participant)
+            raise HTTPException(
+                status_code=404,
+                detail="Participant not found"
+            )
+        
+        max_team_size = self._parse_team_size(filters.max_team_size)
+        teammates, total_participants = self._discover_teammates(current_participant, filters, max_team_size)
+        teams, total_teams = self._discover_teams(current_participant, filters, max_team_size)
+        return DiscoveryResponse(
+            potential_teammates=teammates,
+            available_teams=teams,
+            total_participants=total_participants,
+            total_teams=total_teams
+        )
+    
+    def _discover_teammates(self, current_participant, filters: DiscoveryFilters, max_team_size: Optional[int]) -> Tuple[List[TeammateSuggestion], int]:
+        """Top teammate suggestions and the number of candidates that matched the filters"""
+        # Without filters the precomputed neighbor list already holds the answer
+        if not filters.skills and max_team_size is None and not filters.include_locked_teams:
+            neighbors = compatibility_index.neighbors(self.db, current_participant.participant_id)
+            if neighbors is not None:
+                winners = [
+                    participant_id for score, participant_id in neighbors
+                    if score >= MIN_COMPATIBILITY_SCORE
+                ][:MAX_TEAMMATE_SUGGESTIONS]
+                return (
+                    self._build_suggestions(current_participant, self._load_in_order(winners)),
+                    compatibility_index.candidate_count(current_participant.participant_id)
                 )
-                suggestions.append(suggestion)
         
-        # Sort by compatibility score (highest first)
-        suggestions.sort(key=lambda x: x.compatibility_score, reverse=True)
-        return suggestions[:20]  # Limit to top 20
+        if skill_index.is_warm:
+            # Candidates come from the skill postings with filters applied in memory;
+            # only the winners are loaded from the database
+            skill_index.refresh(self.db)
+            candidate_ids = skill_index.candidates(
+                current_participant.participant_id,
+                skills=filters.skills,
+                max_team_size=max_team_size,
+                include_locked_teams=filters.include_locked_teams
+            )
+            compatibility = SkillMatrix(
+                candidate_ids, [skill_index.skills_of(candidate_id) for candidate_id in candidate_ids]
+            ).score(current_participant.skills)
+            eligible = compatibility.scores >= MIN_COMPATIBILITY_SCORE
+            winners = self._load_in_order([
+                candidate_ids[index] for index in compatibility.top(MAX_TEAMMATE_SUGGESTIONS, eligible)
+            ])
+            return self._build_suggestions(current_participant, winners), len(candidate_ids)
+        
+        # Until the skill index is warm, filters are applied in SQL so only matching candidates are loaded
+        candidates = self.participant_repository.get_discovery_candidates(
+            current_participant.participant_id,
+            skills=filters.skills,
+            max_team_size=max_team_size,
+            include_locked_teams=filters.include_locked_teams
+        )
+        compatibility = SkillMatrix.from_participants(candidates).score(current_participant.skills)
+        
+        # Select the winners first; only they get Pydantic objects and reason strings
+        eligible = compatibility.scores >= MIN_COMPATIBILITY_SCORE
+        winners = [candidates[index] for index in compatibility.top(MAX_TEAMMATE_SUGGESTIONS, eligible)]
+        return self._build_suggestions(current_participant, winners), len(candidates)
     
-    def _get_available_teams(self, current_participant, filters: DiscoveryFilters) -> List[TeamDiscovery]:
-        """Get available teams that can accept new members"""
-        
-        # Get teams that are open to requests
-        open_teams = self.team_repository.get_open_teams()
-        
+    def _parse_team_size(self, max_team_size: Optional[str]) -> Optional[int]:
+        if max_team_size is None:
+            return None
+        try:
+            return int(max_team_size)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="max_team_size must be a whole number"
+            )
+    
+    def _load_in_order(self, participant_ids: List[str]) -> list:
+        """Load participants in one query, preserving the given order"""
+        by_id = {p.participant_id: p for p in self.participant_repository.get_by_ids(participant_ids)}
+        return [by_id[participant_id] for participant_id in participant_ids if participant_id in by_id]
+    
+    def _build_suggestions(self, current_participant, winners: list) -> List[TeammateSuggestion]:
+        """Build suggestions (with reasons) for the selected participants only"""
+        compatibility = SkillMatrix.from_participants(winners).score(current_participant.skills)
+        return [
+            TeammateSuggestion(
+                participant=ParticipantResponse.from_orm(participant),
+                compatibility_score=int(compatibility.scores[index]),
+                reasons=compatibility.reasons(index),
+                skill_diversity=int(compatibility.diversity[index]),
+                skill_overlap=int(compatibility.overlap[index])
+            )
+            for index, participant in enumerate(winners)
+        ]
+    
+    def _discover_teams(self, current_participant, filters: DiscoveryFilters, max_team_size: Optional[int]) -> Tuple[List[TeamDiscovery], int]:
+        """Top open teams for the participant and the number of teams with open slots"""
+        
+        # Open teams with member counts, open slots and member skills in one query
+        profiles = self.team_repository.get_open_team_profiles(
+            exclude_team_id=current_participant.team_id,
+            include_locked_teams=filters.include_locked_teams,
+            max_team_size=max_team_size
+        )
+        if not profiles:
+            return [], 0
+        
+        # Score the participant against every team in one vectorized pass
+        team_skills = SkillMatrix(
+            [profile.Team.team_id for profile in profiles],
+            [profile.member_skills for profile in profiles]
+        )
+        member_counts = np.array([profile.member_count for profile in profiles], dtype=np.int32)
+        participant_skills = set(current_participant.skills or ())
+        new_skills = len(participant_skills) - team_skills.overlap(participant_skills)
+        fills_gaps = (new_skills > 0) & (team_skills.sizes < 10)
+        size_bonus = np.select([member_counts == 1, member_counts == 2, member_counts == 3], [4, 3, 2], 0)
+        scores = np.where(
+            member_counts > 0,
+            new_skills * 2 + fills_gaps * 3 + size_bonus,
+            5  # New team formation
+        )
+        
+        # Only the winners are loaded with members and turned into responses
+        winners = top_indices(scores, MAX_TEAM_SUGGESTIONS)
+        teams = {
+            team.team_id: team
+            for team in self.team_repository.get_by_ids_with_members(
+                [profiles[index].Team.team_id for index in winners]
+            )
+        }
         discoveries = []
-        for team in open_teams:
-            # Skip if team is locked
-            if team.is_locked and not filters.include_locked_teams:
-                continue
-            
-            # Calculate compatibility with team
-            score, reasons = self._calculate_team_compatibility(current_participant, team)
-            
-            # Check team size filter
-            if filters.max_team_size:
-                current_size = len(team.members) if hasattr(team, 'members') else 1
-                max_size = int(filters.max_team_size)
-                if current_size >= max_size:
-                    continue
-            
-            # Calculate open slots
-            current_size = len(team.members) if hasattr(team, 'members') else 1
-            max_size = int(team.max_members) if team.max_members else 4
-            open_slots = max_size - current_size
-            
-            if open_slots > 0:
-                discovery = TeamDiscovery(
-                    team=TeamResponse.from_orm(team),
-                    open_slots=open_slots,
-                    compatibility_score=score,
-                    reasons=reasons
+        for index in winners:
+            team_response = TeamResponse.from_orm(teams[profiles[index].Team.team_id])
+            team_response.member_count = int(member_counts[index])
+            discoveries.append(TeamDiscovery(
+                team=team_response,
+                open_slots=profiles[index].open_slots,
+                compatibility_score=int(scores[index]),
+                reasons=self._team_reasons(
+                    int(member_counts[index]), int(new_skills[index]), bool(fills_gaps[index])
                 )
-                discoveries.append(discovery)
+            ))
+        return discoveries, len(profiles)
+    
+    def _team_reasons(self, member_count: int, new_skills: int, fills_gaps: bool) -> List[str]:
+        """Human-readable reasons matching the team scoring rules"""
+        if member_count == 0:
+            return ["New team formation"]
         
-        # Sort by compatibility score
-        discoveries.sort(key=lambda x: x.compatibility_score, reverse=True)
-        return discoveries[:15]  # Limit to top 15
+        reasons = []
+        if new_skills > 0:
+            reasons.append(f"Adds {new_skills} new skills to team")
+        if fills_gaps:
+            reasons.append("Fills skill gaps in team")
+        if member_count == 1:
+            reasons.append("Perfect for small team")
+        elif member_count == 2:
+            reasons.append("Good for medium team")
+        elif member_count == 3:
+            reasons.append("Completes team")
+        return reasons
     
     def _calculate_compatibility(self, participant1, participant2) -> tuple:
         """Calculate compatibility score between two participants based on skills"""
-        
-        score = 0
-        reasons = []
-        
-        # Skill diversity (different skills = better for team variety)
-        if participant1.skills and participant2.skills:
-            skill_diversity = self._calculate_skill_diversity(participant1, participant2)
-            skill_overlap = self._calculate_skill_overlap(participant1, participant2)
-            
-            # Bonus for complementary skills
-            if skill_diversity > 0:
-                score += min(skill_diversity * 2, 10)
-                reasons.append(f"Adds {skill_diversity} new skills to team")
-            
-            # Moderate bonus for some skill overlap (good for communication)
-            if skill_overlap > 0:
-                score += min(skill_overlap, 5)
-                reasons.append(f"Shares {skill_overlap} skills for better collaboration")
-            
-            # Bonus for balanced skill distribution
-            total_skills = len(set(participant1.skills + participant2.skills))
-            if total_skills >= 8:
-                score += 3
-                reasons.append("Wide skill coverage")
-            elif total_skills >= 5:
-                score += 2
-                reasons.append("Good skill coverage")
-        else:
-            # Fallback if skills are not available
-            score += 5
-            reasons.append("Skills information not available")
-        
-        # Additional bonus for good combinations
-        if participant1.skills and participant2.skills:
-            # Bonus for problem-solving + technical skills combination
-            problem_solving_skills = {'problem_solving', 'algorithms', 'creative_thinking'}
-            technical_skills = {'algebra', 'geometry', 'algorithms', 'pattern_recognition'}
-            
-            p1_has_problem_solving = any(skill in problem_solving_skills for skill in participant1.skills)
-            p2_has_technical = any(skill in technical_skills for skill in participant2.skills)
-            
-            if p1_has_problem_solving and p2_has_technical:
-                score += 4
-                reasons.append("Problem-solving + Technical skills synergy")
-            
-            # Bonus for leadership + collaboration combination
-            leadership_skills = {'leadership', 'team_collaboration'}
-            if any(skill in leadership_skills for skill in participant1.skills) and \
-               any(skill in leadership_skills for skill in participant2.skills):
-                score += 3
-                reasons.append("Leadership + Collaboration synergy")
-        
-        return score, reasons
+        return get_scoring_profile().score_pair(participant1.skills, participant2.skills)
     
     def _calculate_skill_diversity(self, participant1, participant2) -> int:
         """Calculate how many new skills participant2 brings to participant1"""
@@ -172,46 +231,3 @@ class DiscoveryService:
         p1_skills = set(participant1.skills)
         p2_skills = set(participant2.skills)
         return len(p1_skills & p2_skills)
-    
-    def _calculate_team_compatibility(self, participant, team) -> tuple:
-        """Calculate compatibility score between a participant and a team"""
-        
-        score = 0
-        reasons = []
-        
-        if not hasattr(team, 'members') or not team.members:
-            score += 5
-            reasons.append("New team formation")
-            return score, reasons
-        
-        # Calculate team's current skill coverage
-        team_skills = set()
-        for member in team.members:
-            if member.skills:
-                team_skills.update(member.skills)
-        
-        # Calculate what the participant would add
-        if participant.skills:
-            new_skills = set(participant.skills) - team_skills
-            score += len(new_skills) * 2
-            if new_skills:
-                reasons.append(f"Adds {len(new_skills)} new skills to team")
-            
-            # Bonus for filling skill gaps
-            if len(team_skills) < 10 and len(new_skills) > 0:
-                score += 3
-                reasons.append("Fills skill gaps in team")
-        
-        # Bonus for balanced team size
-        current_size = len(team.members)
-        if current_size == 1:
-            score += 4
-            reasons.append("Perfect for small team")
-        elif current_size == 2:
-            score += 3
-            reasons.append("Good for medium team")
-        elif current_size == 3:
-            score += 2
-            reasons.append("Completes team")
-        
-        return score, reasons
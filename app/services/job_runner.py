@@ -0,0 +1,178 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.admin_job_repository import AdminJobRepository
+
+class JobCancelled(Exception):
+    """Raised inside a job handler when cancellation was requested"""
+
+class JobContext:
+    """Handed to job handlers for progress reporting and cooperative cancellation"""
+
+    # Seconds between cancellation checks against the admin_jobs table
+    CANCEL_POLL_SECONDS = 1.0
+
+    def __init__(self, job_id: str, cancel_event: threading.Event):
+        self.job_id = job_id
+        self._cancel_event = cancel_event
+        self._checked_at = time.monotonic()
+
+    def cancelled(self) -> bool:
+        """Has cancellation been requested (in this worker, or via the table by any worker)"""
+        if self._cancel_event.is_set():
+            return True
+        if time.monotonic() - self._checked_at >= self.CANCEL_POLL_SECONDS:
+            self._checked_at = time.monotonic()
+            db = SessionLocal()
+            try:
+                if AdminJobRepository(db).is_cancel_requested(self.job_id):
+                    self._cancel_event.set()
+            finally:
+                db.close()
+        return self._cancel_event.is_set()
+
+    def check(self) -> None:
+        """Raise JobCancelled if cancellation has been requested"""
+        if self.cancelled():
+            raise JobCancelled()
+
+    def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        db = SessionLocal()
+        try:
+            AdminJobRepository(db).update(self.job_id, progress=max(0.0, min(fraction, 1.0)), message=message)
+        finally:
+            db.close()
+
+# A handler gets its own session, the job's params and a JobContext, and returns a JSON-able result
+JobHandler = Callable[..., Optional[dict]]
+
+class JobRunner:
+    """Runs admin jobs on a thread pool, with status and results kept in the admin_jobs table.
+
+    Jobs are stamped with this process's worker id, and a heartbeat thread keeps
+    refreshing them while the process lives. Unfinished jobs whose heartbeat stops
+    (their worker was killed or restarted) are failed by any live worker.
+    """
+
+    # Heartbeats missed before another worker fails a job
+    STALE_HEARTBEATS = 4
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.worker_id = uuid.uuid4().hex
+        self._heartbeat_stop = threading.Event()
+        self._handlers: Dict[str, JobHandler] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def kinds(self):
+        return sorted(self._handlers)
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def submit(self, db, kind: str, params: Optional[dict] = None):
+        """Record a queued job and schedule it; returns the AdminJob row"""
+        if kind not in self._handlers:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown job kind '{kind}'"
+            )
+        job = AdminJobRepository(db).create(kind, params or {}, worker_id=self.worker_id)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="admin-job")
+            self._cancel_events[job.job_id] = threading.Event()
+            self._executor.submit(self._run, job.job_id, kind, params or {})
+        return job
+
+    def cancel(self, db, job_id: str) -> None:
+        AdminJobRepository(db).request_cancel(job_id)
+        with self._lock:
+            event = self._cancel_events.get(str(job_id))
+        if event is not None:
+            event.set()
+
+    def start(self) -> None:
+        """Fail jobs orphaned by stopped workers, then heartbeat this worker's jobs in the background"""
+        self._heartbeat_stop.clear()
+        thread = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(settings.job_heartbeat_seconds,),
+            name="job-heartbeat",
+            daemon=True
+        )
+        thread.start()
+
+    def shutdown(self) -> None:
+        self._heartbeat_stop.set()
+        with self._lock:
+            for event in self._cancel_events.values():
+                event.set()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        # Nothing will finish these once the process exits
+        db = SessionLocal()
+        try:
+            AdminJobRepository(db).fail_unfinished(self.worker_id, "Server shut down before the job finished")
+        except Exception as e:
+            print(f"⚠️ Warning: Could not fail unfinished jobs: {e}")
+        finally:
+            db.close()
+
+    def _heartbeat_loop(self, interval: float) -> None:
+        while True:
+            db = SessionLocal()
+            try:
+                jobs = AdminJobRepository(db)
+                jobs.heartbeat(self.worker_id)
+                failed = jobs.fail_stale(interval * self.STALE_HEARTBEATS)
+                if failed:
+                    print(f"🧹 Failed {failed} jobs left behind by stopped workers")
+            except Exception as e:
+                print(f"⚠️ Warning: Job heartbeat failed: {e}")
+            finally:
+                db.close()
+            if self._heartbeat_stop.wait(interval):
+                return
+
+    def _run(self, job_id: str, kind: str, params: dict) -> None:
+        bookkeeping = SessionLocal()
+        db = SessionLocal()
+        jobs = AdminJobRepository(bookkeeping)
+        try:
+            if not jobs.mark_running(job_id):
+                return
+            context = JobContext(job_id, self._cancel_events[job_id])
+            try:
+                result = self._handlers[kind](db, params, context)
+                closed = jobs.finish(job_id, "succeeded", result=result)
+            except JobCancelled:
+                db.rollback()
+                closed = jobs.finish(job_id, "cancelled")
+            except HTTPException as e:
+                db.rollback()
+                closed = jobs.finish(job_id, "failed", error=str(e.detail))
+            except Exception as e:
+                db.rollback()
+                closed = jobs.finish(job_id, "failed", error=str(e))
+            if not closed:
+                # Failed meanwhile by shutdown or by another worker's stale-job check; that status stands
+                print(f"⚠️ Warning: Job {job_id} was already closed when it finished; its outcome was not recorded")
+        except Exception as e:
+            print(f"⚠️ Warning: Job {job_id} bookkeeping failed: {e}")
+        finally:
+            db.close()
+            bookkeeping.close()
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+
+job_runner = JobRunner(max_workers=settings.job_workers)
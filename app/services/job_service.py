@@ -0,0 +1,104 @@
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.repositories.admin_job_repository import AdminJobRepository
+from app.services.job_runner import JobContext, job_runner
+from app.services.auto_assign_service import AutoAssignService
+from app.services.recommendation_service import RecommendationService
+from app.schemas.job import JobResponse, AutoAssignJobParams, SimulateJobParams, RecommendationsJobParams
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+def _auto_assign_job(db: Session, params: dict, context: JobContext) -> dict:
+    service = AutoAssignService(db)
+    context.progress(0.0, "Computing assignment")
+    plan = service.plan(
+        team_size=params["team_size"],
+        seed=params["seed"],
+        time_budget=params["time_budget"],
+        should_stop=context.cancelled,
+        workers=params["workers"]
+    )
+    context.check()
+    context.progress(0.9, "Writing teams")
+    return service.apply(plan)
+
+def _simulate_job(db: Session, params: dict, context: JobContext) -> dict:
+    context.progress(0.0, "Simulating assignment")
+    result = AutoAssignService(db).simulate(
+        team_size=params["team_size"],
+        seed=params["seed"],
+        max_iterations=params["max_iterations"],
+        workers=params["workers"],
+        fill_open_teams=params["fill_open_teams"],
+        exclude_participant_ids=params["exclude_participant_ids"],
+        should_stop=context.cancelled
+    )
+    context.check()
+    return result
+
+def _recommendations_job(db: Session, params: dict, context: JobContext) -> dict:
+    context.progress(0.0, "Scoring participants")
+    return RecommendationService(db).compute_all(params["k"], checkpoint=context.check)
+
+job_runner.register("auto_assign", _auto_assign_job)
+job_runner.register("simulate", _simulate_job)
+job_runner.register("recommendations", _recommendations_job)
+
+# Handlers read their params already validated and filled with defaults
+JOB_PARAMS = {
+    "auto_assign": AutoAssignJobParams,
+    "simulate": SimulateJobParams,
+    "recommendations": RecommendationsJobParams
+}
+
+class JobService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repository = AdminJobRepository(db)
+    
+    def submit(self, kind: str, params: Optional[dict] = None) -> JobResponse:
+        if kind in JOB_PARAMS:
+            try:
+                params = JOB_PARAMS[kind](**(params or {})).dict()
+            except ValidationError as e:
+                raise HTTPException(
+                    status_code=422,
+                    detail=e.errors(include_url=False)
+                )
+        job = job_runner.submit(self.db, kind, params)
+        return JobResponse.from_orm(job)
+    
+    def get_recent_jobs(self, limit: int = 50) -> List[JobResponse]:
+        return [JobResponse.from_orm(job) for job in self.repository.get_recent(limit)]
+    
+    def get_job(self, job_id: str) -> JobResponse:
+        return JobResponse.from_orm(self._get_or_404(job_id))
+    
+    def get_result(self, job_id: str) -> dict:
+        job = self._get_or_404(job_id)
+        if job.status != "succeeded":
+            raise HTTPException(
+                status_code=409,
+                detail=f"Job is {job.status}" + (f": {job.error}" if job.error else "")
+            )
+        return job.result or {}
+    
+    def cancel(self, job_id: str) -> JobResponse:
+        job = self._get_or_404(job_id)
+        if job.status in ("succeeded", "failed", "cancelled"):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Job already {job.status}"
+            )
+        job_runner.cancel(self.db, job.job_id)
+        self.db.refresh(job)
+        return JobResponse.from_orm(job)
+    
+    def _get_or_404(self, job_id: str):
+        job = self.repository.get_by_id(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=404,
+                detail="Job not found"
+            )
+        return job
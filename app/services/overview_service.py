@@ -0,0 +1,46 @@
+from sqlalchemy.orm import Session
+from app.repositories.participant_repository import ParticipantRepository
+from app.repositories.team_repository import TeamRepository
+from app.services.suggestion_service import SuggestionService
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import snapshot_session
+from app.core.roster import roster_version
+
+# One entry per roster version; concurrent misses share one computation
+_overview_cache = TTLCache(max_entries=4, ttl_seconds=settings.overview_cache_ttl_seconds, name="system_overview")
+
+class OverviewService:
+    def get_system_overview(self) -> dict:
+        """Get the admin system overview (cached for a few seconds, concurrent requests coalesced)"""
+        return _overview_cache.get_or_set(roster_version.value, self._build_overview, coalesce=True)
+
+    def _build_overview(self) -> dict:
+        # Four aggregate queries, all reading the same REPEATABLE READ snapshot
+        with snapshot_session() as db:
+            return self._collect(db)
+
+    def _collect(self, db: Session) -> dict:
+        participant_repository = ParticipantRepository(db)
+        team_repository = TeamRepository(db)
+
+        participants = participant_repository.get_roster_counts()
+        skill_distribution = participant_repository.get_skill_counts()
+        unassigned_skills = participant_repository.get_unassigned_skill_counts()
+        team_stats = team_repository.get_size_counts()
+        team_stats["teams_with_members"] = team_stats["total_teams"] - team_stats["empty_teams"]
+
+        return {
+            "participants": {
+                "total": participants["total"],
+                "unassigned": participants["unassigned"],
+                "assigned": participants["total"] - participants["unassigned"],
+                "skill_distribution": dict(sorted(skill_distribution.items(), key=lambda item: (-item[1], item[0])))
+            },
+            "teams": {
+                "total": team_stats["total_teams"],
+                "statistics": team_stats
+            },
+            "auto_assignment": SuggestionService(db).summarize_unassigned(participants["unassigned"], unassigned_skills),
+            "system_status": "operational"
+        }
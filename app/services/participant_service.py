@@ -2,13 +2,20 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from app.repositories.participant_repository import ParticipantRepository
-from app.schemas.participant import ParticipantCreate, ParticipantUpdate, ParticipantResponse
+from app.models.participant import Participant
+from app.schemas.participant import ParticipantCreate, ParticipantUpdate, ParticipantResponse, ParticipantChanges
+from app.services.change_feed import paginate_changes
+from app.core.cache import TTLCache
+from app.core.config import settings
 from fastapi import HTTPException
 from passlib.context import CryptContext
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Short-lived cache for typeahead queries, keyed by normalized query and limit
+_search_cache = TTLCache(max_entries=2048, ttl_seconds=settings.search_cache_ttl_seconds, name="participant_search")
+
 class ParticipantService:
     def __init__(self, db: Session):
         self.db = db
@@ -114,11 +121,39 @@ class ParticipantService:
             )
         return success
     
+    def search_participants(self, query: str, limit: Optional[int] = None) -> List[ParticipantResponse]:
+        """Search participants by partial name or USN for search-as-you-type"""
+        normalized = " ".join(query.split()).lower()
+        limit = min(limit or settings.search_result_limit, settings.search_result_limit)
+        return _search_cache.get_or_set(
+            (normalized, limit),
+            lambda: [ParticipantResponse.from_orm(p) for p in self.repository.search(normalized, limit)]
+        )
+    
     def get_unassigned_participants(self) -> List[ParticipantResponse]:
         """Get participants not assigned to any team"""
         participants = self.repository.get_unassigned_participants()
         return [ParticipantResponse.from_orm(p) for p in participants]
     
+    def get_unassigned_changes(self, since: int, limit: int) -> ParticipantChanges:
+        """Get changes to the unassigned participant list since a change cursor"""
+        changed = self.repository.get_changed_since(since, limit + 1)
+        deleted = self.repository.get_deleted_since(since, limit + 1)
+        page, cursor, has_more = paginate_changes(changed, deleted, since, limit)
+        
+        upserted = []
+        removed = []
+        for item in page:
+            if isinstance(item, Participant) and item.team_id is None:
+                upserted.append(ParticipantResponse.from_orm(item))
+            elif isinstance(item, Participant):
+                # Joined a team, so it leaves the unassigned list
+                removed.append(item.participant_id)
+            else:
+                removed.append(item.entity_id)
+        
+        return ParticipantChanges(cursor=cursor, has_more=has_more, upserted=upserted, removed=removed)
+    
     def get_participants_by_skill(self, skill: str) -> List[ParticipantResponse]:
         """Get participants by skill"""
         participants = self.repository.get_participants_by_skill(skill)
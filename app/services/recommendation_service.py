@@ -0,0 +1,73 @@
+import json
+import time
+import numpy as np
+from itertools import groupby
+from sqlalchemy.orm import Session
+from typing import Callable, Iterator, Optional
+from app.repositories.participant_repository import ParticipantRepository
+from app.repositories.team_repository import TeamRepository
+from app.repositories.recommendation_repository import RecommendationRepository
+from app.services.discovery_service import MIN_COMPATIBILITY_SCORE
+from app.services.skill_matrix import SkillMatrix, batch_top_k
+from app.core.config import settings
+
+class RecommendationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.participant_repository = ParticipantRepository(db)
+        self.team_repository = TeamRepository(db)
+        self.recommendation_repository = RecommendationRepository(db)
+    
+    def compute_all(self, k: Optional[int] = None, checkpoint: Optional[Callable[[], None]] = None) -> dict:
+        """Compute and store the top-k teammates of every unassigned participant in one pass.
+        
+        checkpoint, if given, is called once per participant and may raise to abort (nothing is stored).
+        """
+        k = k or settings.recommendation_batch_k
+        started = time.monotonic()
+        
+        rows = self.participant_repository.get_skill_rows()
+        locked_teams = {team_id for team_id, is_locked in self.team_repository.get_lock_states() if is_locked}
+        matrix = SkillMatrix([row.participant_id for row in rows], [row.skills for row in rows])
+        
+        # Same candidate rules as discovery: unassigned or in an unlocked team
+        available = np.array([not row.team_id or row.team_id not in locked_teams for row in rows], dtype=bool)
+        owners = [index for index, row in enumerate(rows) if not row.team_id]
+        
+        ids = matrix.participant_ids
+        
+        def records():
+            for owner, entries in batch_top_k(matrix, owners, k, available, MIN_COMPATIBILITY_SCORE):
+                if checkpoint:
+                    checkpoint()
+                for rank, (score, column) in enumerate(entries, start=1):
+                    yield {
+                        "participant_id": ids[owner],
+                        "rank": rank,
+                        "candidate_id": ids[column],
+                        "compatibility_score": score
+                    }
+        
+        written = self.recommendation_repository.replace_all(records())
+        
+        return {
+            "participants": len(owners),
+            "candidates": int(available.sum()),
+            "recommendations": written,
+            "k": k,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1)
+        }
+    
+    def export_lines(self) -> Iterator[str]:
+        """Stored recommendations as NDJSON, one line per participant"""
+        recommendations = self.recommendation_repository.iter_all()
+        for participant_id, entries in groupby(recommendations, key=lambda r: r.participant_id):
+            entries = list(entries)
+            yield json.dumps({
+                "participant_id": participant_id,
+                "computed_at": entries[0].computed_at.isoformat() if entries[0].computed_at else None,
+                "recommendations": [
+                    {"participant_id": entry.candidate_id, "compatibility_score": entry.compatibility_score}
+                    for entry in entries
+                ]
+            }) + "\n"
@@ -0,0 +1,82 @@
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.events import event_broker
+from app.repositories.team_request_repository import TeamRequestRepository
+
+# Postgres advisory lock key held by whichever worker is sweeping
+SWEEP_LOCK_KEY = 0x6D617468
+
+def sweep_expired_requests() -> int:
+    """Expire stale pending requests if no other worker is already doing it.
+
+    The advisory lock is taken on a connection held for the whole sweep (session
+    commits hand theirs back to the pool), so across all gunicorn workers only
+    one sweeps at a time and the others skip the round. Returns the number expired.
+    """
+    with engine.connect() as lock_connection:
+        acquired = lock_connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SWEEP_LOCK_KEY}).scalar()
+        lock_connection.commit()
+        if not acquired:
+            return 0
+        try:
+            return _sweep()
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SWEEP_LOCK_KEY})
+            lock_connection.commit()
+
+def _sweep() -> int:
+    cutoff = datetime.now() - timedelta(days=settings.request_expiry_days)
+    batch_size = settings.request_sweep_batch_size
+    count = 0
+    db = SessionLocal()
+    try:
+        repository = TeamRequestRepository(db)
+        while True:
+            expired = repository.expire_pending_batch(cutoff, batch_size)
+            count += len(expired)
+            _notify(expired)
+            if len(expired) < batch_size:
+                return count
+    finally:
+        db.close()
+
+def _notify(expired: List[Tuple[str, str, str]]) -> None:
+    # One event per participant and batch rather than per request, all in one NOTIFY round trip; clients refetch on it
+    changes: Dict[str, Dict[str, int]] = defaultdict(lambda: {"incoming": 0, "outgoing": 0})
+    for _, from_participant_id, to_participant_id in expired:
+        changes[str(from_participant_id)]["outgoing"] += 1
+        changes[str(to_participant_id)]["incoming"] += 1
+    event_broker.publish_many(
+        (participant_id, "requests_expired", {"status": "expired", **data})
+        for participant_id, data in changes.items()
+    )
+
+_sweeper_stop = threading.Event()
+
+def _sweep_loop(interval: float) -> None:
+    while not _sweeper_stop.wait(interval):
+        try:
+            count = sweep_expired_requests()
+            if count:
+                print(f"🧹 Expired {count} stale team requests")
+        except Exception as e:
+            print(f"⚠️ Warning: Request expiry sweep failed: {e}")
+
+def start_request_sweeper() -> None:
+    """Expire stale pending requests periodically in the background"""
+    _sweeper_stop.clear()
+    thread = threading.Thread(
+        target=_sweep_loop,
+        args=(settings.request_sweep_seconds,),
+        name="request-sweeper",
+        daemon=True
+    )
+    thread.start()
+
+def stop_request_sweeper() -> None:
+    _sweeper_stop.set()
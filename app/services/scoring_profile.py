@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from app.core.config import settings
+
+# Rules used when SCORING_PROFILE_PATH is not set (the original compatibility rules)
+DEFAULT_SCORING_PROFILE = {
+    "skill_groups": {
+        "problem_solving": ["problem_solving", "algorithms", "creative_thinking"],
+        "technical": ["algebra", "geometry", "algorithms", "pattern_recognition"],
+        "leadership": ["leadership", "team_collaboration"]
+    },
+    "diversity": {"points_per_skill": 2, "max_points": 10},
+    "overlap": {"points_per_skill": 1, "max_points": 5},
+    "coverage_tiers": [
+        {"min_skills": 8, "points": 3, "reason": "Wide skill coverage"},
+        {"min_skills": 5, "points": 2, "reason": "Good skill coverage"}
+    ],
+    "synergies": [
+        {
+            "requester_group": "problem_solving",
+            "candidate_group": "technical",
+            "points": 4,
+            "reason": "Problem-solving + Technical skills synergy"
+        },
+        {
+            "requester_group": "leadership",
+            "candidate_group": "leadership",
+            "points": 3,
+            "reason": "Leadership + Collaboration synergy"
+        }
+    ],
+    "missing_skills_score": 5
+}
+
+class CoverageTier(NamedTuple):
+    min_skills: int
+    points: int
+    reason: str
+
+class Synergy(NamedTuple):
+    requester_skills: frozenset
+    candidate_skills: frozenset
+    points: int
+    reason: str
+
+class ScoringProfile:
+    """Compatibility scoring rules compiled once from a config dict.
+
+    Skill groups become frozensets (SkillMatrix turns them into per-row flags when it
+    is built), and weights become plain ints, so scoring allocates nothing per pair.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        # Content hash: the same rules give the same version in every worker
+        self.version = profile_hash(config)
+        groups = {name: frozenset(skills) for name, skills in config.get("skill_groups", {}).items()}
+
+        self.diversity_points = int(config["diversity"]["points_per_skill"])
+        self.diversity_max = int(config["diversity"]["max_points"])
+        self.overlap_points = int(config["overlap"]["points_per_skill"])
+        self.overlap_max = int(config["overlap"]["max_points"])
+        self.missing_skills_score = int(config["missing_skills_score"])
+        # Highest threshold first; only the first tier reached scores
+        self.coverage_tiers: List[CoverageTier] = sorted(
+            (CoverageTier(int(tier["min_skills"]), int(tier["points"]), tier["reason"]) for tier in config.get("coverage_tiers", [])),
+            reverse=True
+        )
+
+        self.synergies: List[Synergy] = []
+        for rule in config.get("synergies", []):
+            for key in ("requester_group", "candidate_group"):
+                if rule[key] not in groups:
+                    raise ValueError(f"Synergy references unknown skill group '{rule[key]}'")
+            self.synergies.append(Synergy(
+                groups[rule["requester_group"]],
+                groups[rule["candidate_group"]],
+                int(rule["points"]),
+                rule["reason"]
+            ))
+
+    def score_pair(self, requester_skills: Optional[Iterable[str]], candidate_skills: Optional[Iterable[str]]) -> Tuple[int, List[str]]:
+        """Score one candidate for one requester, with reasons in rule order"""
+        requester = set(requester_skills or ())
+        candidate = set(candidate_skills or ())
+        if not requester or not candidate:
+            return self.missing_skills_score, ["Skills information not available"]
+
+        score = 0
+        reasons = []
+        diversity = len(candidate - requester)
+        overlap = len(requester & candidate)
+        if diversity > 0:
+            score += min(diversity * self.diversity_points, self.diversity_max)
+            reasons.append(f"Adds {diversity} new skills to team")
+        if overlap > 0:
+            score += min(overlap * self.overlap_points, self.overlap_max)
+            reasons.append(f"Shares {overlap} skills for better collaboration")
+
+        union = len(requester | candidate)
+        for tier in self.coverage_tiers:
+            if union >= tier.min_skills:
+                score += tier.points
+                reasons.append(tier.reason)
+                break
+
+        for synergy in self.synergies:
+            if requester & synergy.requester_skills and candidate & synergy.candidate_skills:
+                score += synergy.points
+                reasons.append(synergy.reason)
+        return score, reasons
+
+def profile_hash(config: dict) -> str:
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+def load_scoring_config(path: Optional[str] = None) -> dict:
+    """Read the scoring profile JSON file, or the built-in rules when no path is configured"""
+    if not path:
+        return DEFAULT_SCORING_PROFILE
+    with open(path) as profile_file:
+        return json.load(profile_file)
+
+# Seconds between checks of the profile file's modification time
+PROFILE_CHECK_SECONDS = 1.0
+
+def _profile_mtime() -> Optional[float]:
+    if not settings.scoring_profile_path:
+        return None
+    try:
+        return os.stat(settings.scoring_profile_path).st_mtime
+    except OSError:
+        return None
+
+def _initial_profile() -> ScoringProfile:
+    try:
+        return ScoringProfile(load_scoring_config(settings.scoring_profile_path))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"⚠️ Warning: Could not load scoring profile, using built-in rules: {e}")
+        return ScoringProfile(DEFAULT_SCORING_PROFILE)
+
+_profile_lock = threading.Lock()
+_profile_mtime_seen = _profile_mtime()
+_profile = _initial_profile()
+_checked_at = time.monotonic()
+
+def get_scoring_profile() -> ScoringProfile:
+    """The active profile, re-read when the profile file changed (checked at most once a second).
+
+    Every gunicorn worker polls the same file, so a reload served by one worker, or an
+    edit on disk, reaches all of them within PROFILE_CHECK_SECONDS.
+    """
+    global _checked_at
+    if time.monotonic() - _checked_at >= PROFILE_CHECK_SECONDS:
+        _checked_at = time.monotonic()
+        if _profile_mtime() != _profile_mtime_seen:
+            try:
+                reload_scoring_profile()
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"⚠️ Warning: Could not reload scoring profile, keeping version {_profile.version}: {e}")
+    return _profile
+
+def reload_scoring_profile() -> ScoringProfile:
+    """Re-read and compile the configured profile; the old one stays active if it is invalid"""
+    global _profile, _profile_mtime_seen
+    with _profile_lock:
+        mtime = _profile_mtime()
+        # Remember the file version even if it is invalid, so it is not retried on every check
+        _profile_mtime_seen = mtime
+        profile = ScoringProfile(load_scoring_config(settings.scoring_profile_path))
+        if profile.version != _profile.version:
+            _profile = profile
+        return _profile
@@ -0,0 +1,269 @@
+import heapq
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.services.scoring_profile import ScoringProfile, get_scoring_profile
+
+# Score-matrix cells per block in batch_top_k (~8 MB per int32/float32 temporary)
+BATCH_CELLS = 2_000_000
+
+def top_indices(scores: np.ndarray, k: int, eligible: Optional[np.ndarray] = None) -> List[int]:
+    """Indices of the k highest scores (ties keep index order), best first"""
+    candidates = range(len(scores)) if eligible is None else np.flatnonzero(eligible).tolist()
+    values = scores.tolist()
+    return heapq.nsmallest(k, candidates, key=lambda i: (-values[i], i))
+
+def batch_top_k(matrix: "SkillMatrix", owner_rows: Sequence[int], k: int, eligible: np.ndarray, min_score: Optional[int] = None) -> Iterator[Tuple[int, List[Tuple[int, int]]]]:
+    """Top-k (score, row) lists for many requester rows at once, best first.
+
+    Owners are scored in blocks with one matrix-matrix product each, and each block's
+    winners are picked with argpartition. Ties keep row order, so every list equals
+    score(...).top(k, eligible) for that owner (with the owner itself excluded).
+    """
+    n = len(matrix.participant_ids)
+    k = min(k, n)
+    owner_rows = np.asarray(owner_rows, dtype=np.int64)
+    # Pack (score, earlier row first) into one sortable int64 key
+    tiebreak = np.arange(n - 1, -1, -1, dtype=np.int64)
+    block = max(1, BATCH_CELLS // max(n, 1))
+
+    for start in range(0, len(owner_rows), block):
+        rows = owner_rows[start:start + block]
+        if k == 0:
+            for row in rows.tolist():
+                yield row, []
+            continue
+
+        scores = matrix.score_rows(rows)
+        selectable = np.repeat(eligible[None, :], len(rows), axis=0)
+        selectable[np.arange(len(rows)), rows] = False
+        if min_score is not None:
+            selectable &= scores >= min_score
+        keys = np.where(selectable, scores.astype(np.int64) * n + tiebreak, -1)
+
+        top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        top_keys = np.take_along_axis(keys, top, axis=1)
+        order = np.argsort(-top_keys, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_keys = np.take_along_axis(top_keys, order, axis=1)
+
+        for i, row in enumerate(rows.tolist()):
+            columns = top[i][top_keys[i] >= 0].tolist()
+            yield row, [(int(scores[i, column]), column) for column in columns]
+
+class CompatibilityScores:
+    """Vectorized compatibility of one participant against every row of a SkillMatrix"""
+
+    def __init__(self, profile: ScoringProfile, scores, diversity, overlap, union, has_skills, synergies):
+        self.profile = profile
+        self.scores = scores
+        self.diversity = diversity
+        self.overlap = overlap
+        self.union = union
+        self.has_skills = has_skills
+        # One boolean array per profile synergy rule, in rule order
+        self.synergies = synergies
+
+    def top(self, k: int, eligible: Optional[np.ndarray] = None) -> List[int]:
+        """Indices of the k best-scoring rows (ties keep row order), best first"""
+        return top_indices(self.scores, k, eligible)
+
+    def reasons(self, index: int) -> List[str]:
+        """Human-readable reasons for one candidate, in the same order as the scoring rules"""
+        if not self.has_skills[index]:
+            return ["Skills information not available"]
+
+        reasons = []
+        diversity = int(self.diversity[index])
+        overlap = int(self.overlap[index])
+        union = int(self.union[index])
+        if diversity > 0:
+            reasons.append(f"Adds {diversity} new skills to team")
+        if overlap > 0:
+            reasons.append(f"Shares {overlap} skills for better collaboration")
+        for tier in self.profile.coverage_tiers:
+            if union >= tier.min_skills:
+                reasons.append(tier.reason)
+                break
+        for synergy, flags in zip(self.profile.synergies, self.synergies):
+            if flags[index]:
+                reasons.append(synergy.reason)
+        return reasons
+
+class SkillMatrix:
+    """Participants' skills as a dense 0/1 incidence matrix (rows: participants, columns: skills).
+
+    Skill vocabularies are small (tens of skills), so a dense float32 matrix keeps
+    one BLAS matrix-vector product per query while staying around 200 bytes per row.
+    Rows can be upserted and removed in place; removed rows are inactive and reused.
+    Scoring follows the ScoringProfile active when the matrix was built; per-row
+    flags for every skill group the profile's synergies use are kept alongside.
+    """
+
+    def __init__(self, participant_ids: Sequence[str] = (), skill_lists: Sequence[Optional[Iterable[str]]] = (), profile: Optional[ScoringProfile] = None):
+        self.profile = profile or get_scoring_profile()
+        self.participant_ids: List[Optional[str]] = list(participant_ids)
+        self.row_of: Dict[str, int] = {pid: row for row, pid in enumerate(self.participant_ids)}
+        self.vocabulary: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+
+        rows, columns = [], []
+        for row, skills in enumerate(skill_lists):
+            for skill in set(skills or ()):
+                rows.append(row)
+                columns.append(self.vocabulary.setdefault(skill, len(self.vocabulary)))
+
+        self.matrix = np.zeros((len(self.participant_ids), max(len(self.vocabulary), 1)), dtype=np.float32)
+        self.matrix[rows, columns] = 1.0
+        self.active = np.ones(len(self.participant_ids), dtype=bool)
+        self.sizes = self.matrix.sum(axis=1).astype(np.int32)
+
+        groups = set()
+        for synergy in self.profile.synergies:
+            groups.add(synergy.requester_skills)
+            groups.add(synergy.candidate_skills)
+        self.group_flags: Dict[frozenset, np.ndarray] = {group: self.has_any(group) for group in groups}
+
+    @classmethod
+    def from_participants(cls, participants) -> "SkillMatrix":
+        return cls(
+            [p.participant_id for p in participants],
+            [p.skills for p in participants]
+        )
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def upsert(self, participant_id: str, skills: Optional[Iterable[str]]) -> int:
+        """Insert or replace a participant's row and return its row index"""
+        skills = set(skills or ())
+        row = self.row_of.get(participant_id)
+        if row is None:
+            row = self._allocate_row(participant_id)
+
+        for skill in skills:
+            if skill not in self.vocabulary:
+                self.vocabulary[skill] = len(self.vocabulary)
+                if len(self.vocabulary) > self.matrix.shape[1]:
+                    self.matrix = np.hstack([self.matrix, np.zeros((self.matrix.shape[0], 1), dtype=np.float32)])
+
+        self.matrix[row] = self.mask(skills)
+        self.active[row] = True
+        self.sizes[row] = len(skills)
+        for group, flags in self.group_flags.items():
+            flags[row] = bool(skills & group)
+        return row
+
+    def remove(self, participant_id: str) -> None:
+        """Clear a participant's row and make it available for reuse"""
+        row = self.row_of.pop(participant_id, None)
+        if row is None:
+            return
+        self.participant_ids[row] = None
+        self.matrix[row] = 0.0
+        self.active[row] = False
+        self.sizes[row] = 0
+        for flags in self.group_flags.values():
+            flags[row] = False
+        self._free_rows.append(row)
+
+    def _allocate_row(self, participant_id: str) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self.participant_ids[row] = participant_id
+        else:
+            row = len(self.participant_ids)
+            self.participant_ids.append(participant_id)
+            self.matrix = np.vstack([self.matrix, np.zeros((1, self.matrix.shape[1]), dtype=np.float32)])
+            self.active = np.append(self.active, False)
+            self.sizes = np.append(self.sizes, np.int32(0))
+            for group in self.group_flags:
+                self.group_flags[group] = np.append(self.group_flags[group], False)
+        self.row_of[participant_id] = row
+        return row
+
+    def mask(self, skills: Iterable[str]) -> np.ndarray:
+        """0/1 vector over the vocabulary for the given skills (unknown skills are ignored)"""
+        vector = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        columns = [self.vocabulary[skill] for skill in set(skills) if skill in self.vocabulary]
+        vector[columns] = 1.0
+        return vector
+
+    def has_any(self, skills: Iterable[str]) -> np.ndarray:
+        """Boolean per row: does the participant have at least one of the skills"""
+        return (self.matrix @ self.mask(skills)) > 0
+
+    def overlap(self, skills: Iterable[str]) -> np.ndarray:
+        """Number of the given skills each row has"""
+        return np.rint(self.matrix @ self.mask(skills)).astype(np.int32)
+
+    def _coverage_points(self, union: np.ndarray) -> np.ndarray:
+        tiers = self.profile.coverage_tiers
+        return np.select([union >= tier.min_skills for tier in tiers], [tier.points for tier in tiers], 0)
+
+    def score_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Scores of the given rows (as requesters) against every row, shape (len(rows), len(self)).
+
+        Same rules as score(), computed for a block of requesters with one matrix
+        product; int16 arithmetic keeps the per-cell temporaries small.
+        """
+        profile = self.profile
+        sizes = self.sizes.astype(np.int16)
+        owner_sizes = sizes[rows][:, None]
+        overlap = (self.matrix[rows] @ self.matrix.T).astype(np.int16)
+        union = owner_sizes + sizes - overlap
+
+        scores = np.minimum((sizes - overlap) * np.int16(profile.diversity_points), profile.diversity_max)
+        scores += np.minimum(overlap * np.int16(profile.overlap_points), profile.overlap_max)
+        scores += self._coverage_points(union).astype(np.int16)
+        for synergy in profile.synergies:
+            flags = np.outer(self.group_flags[synergy.requester_skills][rows], self.group_flags[synergy.candidate_skills])
+            scores += flags.astype(np.int16) * np.int16(synergy.points)
+        scores[~((owner_sizes > 0) & (sizes > 0))] = profile.missing_skills_score
+        return scores
+
+    def score(self, skills: Optional[Iterable[str]], as_candidate: bool = False) -> CompatibilityScores:
+        """Score a participant with the given skills against every row in one pass.
+
+        By default the given participant is the requester and each row a candidate,
+        mirroring ScoringProfile.score_pair(participant, row) exactly. With
+        as_candidate=True the roles are swapped: each row is the requester.
+        """
+        profile = self.profile
+        query = set(skills or ())
+        has_skills = (self.sizes > 0) & bool(query)
+
+        overlap = self.overlap(query)
+        overlap[~has_skills] = 0
+        union = len(query) + self.sizes - overlap
+
+        if as_candidate:
+            diversity = np.where(has_skills, len(query) - overlap, 0)
+            synergies = [
+                has_skills & self.group_flags[synergy.requester_skills] & bool(query & synergy.candidate_skills)
+                for synergy in profile.synergies
+            ]
+        else:
+            diversity = np.where(has_skills, self.sizes - overlap, 0)
+            synergies = [
+                has_skills & self.group_flags[synergy.candidate_skills] & bool(query & synergy.requester_skills)
+                for synergy in profile.synergies
+            ]
+
+        scores = (
+            np.minimum(diversity * profile.diversity_points, profile.diversity_max)
+            + np.minimum(overlap * profile.overlap_points, profile.overlap_max)
+            + self._coverage_points(union)
+        )
+        for synergy, flags in zip(profile.synergies, synergies):
+            scores = scores + flags * synergy.points
+        scores = np.where(has_skills, scores, profile.missing_skills_score).astype(np.int32)
+
+        return CompatibilityScores(
+            profile=profile,
+            scores=scores,
+            diversity=diversity,
+            overlap=overlap,
+            union=union,
+            has_skills=has_skills,
+            synergies=synergies
+        )
@@ -1,12 +1,23 @@
+import heapq
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List
 from uuid import UUID
 from app.repositories.participant_repository import ParticipantRepository
 from app.repositories.team_repository import TeamRepository
-from app.schemas.suggestion import TeammateSuggestion, SuggestionResponse
+from app.repositories.skill_index import skill_index
+from app.schemas.suggestion import TeammateSuggestion, SuggestionResponse, GapFillCandidate, TeamGapFillResponse
 from app.schemas.participant import ParticipantResponse
+from app.services.skill_matrix import SkillMatrix
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.roster import roster_version
 from fastapi import HTTPException
 
+TEAM_SIZE = 4
+
+# Auto-team summary per roster version; a roster change makes the old entry unreachable
+_summary_cache = TTLCache(max_entries=8, ttl_seconds=settings.summary_cache_ttl_seconds, name="auto_team_summary")
+
 class SuggestionService:
     def __init__(self, db: Session):
         self.db = db
@@ -14,182 +25,170 @@ class SuggestionService:
         self.team_repository = TeamRepository(db)
     
     def get_teammate_suggestions(self, participant_id: UUID, max_suggestions: int = 5) -> SuggestionResponse:
-        """Get intelligent teammate suggestions based on interest cluster diversity"""
-        # Verify participant exists
-        participant = self.participant_repository.get_by_id(participant_id)
+        """Get teammate suggestions scored by the active compatibility profile.
+        
+        Three queries regardless of roster size: the participant with their teammates'
+        skills, the (id, skills) rows of every unassigned participant, and the winners.
+        """
+        team_rows = self.participant_repository.get_team_skill_rows(participant_id)
+        participant = next((row for row in team_rows if row.participant_id == str(participant_id)), None)
         if not participant:
             raise HTTPException(
                 status_code=404,
                 detail="Participant not found"
             )
         
-        # Get current team members' clusters
-        current_clusters = set()
-        team_size = 0
-        
-        if participant.team_id:
-            team_members = self.participant_repository.get_team_members(participant.team_id)
-            current_clusters = {member.interest_cluster for member in team_members}
-            team_size = len(team_members)
-        
-        # Add participant's own cluster
-        current_clusters.add(participant.interest_cluster)
+        # The team's combined skills (the participant's own included)
+        current_skills = set()
+        for row in team_rows:
+            current_skills.update(row.skills or ())
+        team_size = len(team_rows) if participant.team_id else 0
         
         # If team is full, no suggestions needed
         if team_size >= 4:
             return SuggestionResponse(suggestions=[], total_found=0)
         
-        # Find clusters not represented in current team
-        all_clusters = {1, 2, 3, 4, 5}
-        available_clusters = all_clusters - current_clusters
-        
-        suggestions = []
-        
-        # Priority 1: Participants from different clusters (diversity)
-        for cluster in available_clusters:
-            cluster_participants = self.participant_repository.get_participants_by_cluster(cluster)
-            
-            for cluster_participant in cluster_participants:
-                if len(suggestions) >= max_suggestions:
-                    break
-                
-                # Calculate match score based on diversity
-                match_score = self._calculate_diversity_score(
-                    participant, cluster_participant, current_clusters
-                )
-                
-                suggestion = TeammateSuggestion(
-                    participant=ParticipantResponse.from_orm(cluster_participant),
-                    match_score=match_score,
-                    reason=f"Different interest cluster ({cluster_participant.interest_cluster}) for team diversity"
-                )
-                
-                suggestions.append(suggestion)
-            
-            if len(suggestions) >= max_suggestions:
-                break
-        
-        # Priority 2: If we don't have enough suggestions, add from any unassigned participants
-        if len(suggestions) < max_suggestions:
-            remaining_needed = max_suggestions - len(suggestions)
-            unassigned = self.participant_repository.get_unassigned_participants()
-            
-            # Exclude already suggested participants and the requesting participant
-            suggested_ids = {s.participant.participant_id for s in suggestions}
-            suggested_ids.add(participant_id)
-            
-            additional = [
-                p for p in unassigned 
-                if p.participant_id not in suggested_ids
-            ][:remaining_needed]
-            
-            for additional_participant in additional:
-                match_score = self._calculate_collaboration_score(
-                    participant, additional_participant
-                )
-                
-                suggestion = TeammateSuggestion(
-                    participant=ParticipantResponse.from_orm(additional_participant),
-                    match_score=match_score,
-                    reason="Additional unassigned participant for team completion"
-                )
-                
-                suggestions.append(suggestion)
+        # Score every unassigned participant against the team's skills in one pass
+        candidates = [
+            row for row in self.participant_repository.get_unassigned_skill_rows()
+            if row.participant_id != participant.participant_id
+        ]
+        if not candidates:
+            return SuggestionResponse(suggestions=[], total_found=0)
+        matrix = SkillMatrix(
+            [row.participant_id for row in candidates],
+            [row.skills for row in candidates]
+        )
+        scores = matrix.score(current_skills)
+        top = scores.top(max_suggestions)
         
-        # Sort by match score (highest first)
-        suggestions.sort(key=lambda x: x.match_score, reverse=True)
+        winners = {
+            candidate.participant_id: candidate
+            for candidate in self.participant_repository.get_by_ids([matrix.participant_ids[row] for row in top])
+        }
+        suggestions = [
+            TeammateSuggestion(
+                participant=ParticipantResponse.from_orm(winners[matrix.participant_ids[row]]),
+                match_score=float(scores.scores[row]),
+                reason="; ".join(scores.reasons(row))
+            )
+            for row in top
+            if matrix.participant_ids[row] in winners
+        ]
         
         return SuggestionResponse(
-            suggestions=suggestions[:max_suggestions],
-            total_found=len(suggestions)
+            suggestions=suggestions,
+            total_found=len(candidates)
         )
     
-    def _calculate_diversity_score(self, requester, candidate, current_clusters: set) -> float:
-        """Calculate match score based on diversity"""
-        base_score = 10.0
-        
-        # Bonus for different cluster
-        if candidate.interest_cluster not in current_clusters:
-            base_score += 5.0
-        
-        # Bonus for different department (cross-disciplinary collaboration)
-        if requester.department != candidate.department:
-            base_score += 2.0
-        
-        # Bonus for different year (experience diversity)
-        year_diff = abs(requester.year - candidate.year)
-        if year_diff > 0:
-            base_score += min(year_diff, 3) * 0.5
-        
-        return base_score
-    
-    def _calculate_collaboration_score(self, requester, candidate) -> float:
-        """Calculate match score based on collaboration potential"""
-        base_score = 5.0
-        
-        # Bonus for same department (easier communication)
-        if requester.department == candidate.department:
-            base_score += 3.0
-        
-        # Bonus for similar year (similar experience level)
-        year_diff = abs(requester.year - candidate.year)
-        if year_diff == 0:
-            base_score += 2.0
-        elif year_diff == 1:
-            base_score += 1.0
+    def get_team_gap_fill(self, team_id: str, limit: int = 10) -> TeamGapFillResponse:
+        """Rank unassigned participants by how many skills they would add to a team.
+        
+        The team's skill profile and the candidates come from the skill index, which
+        keeps per-team skill counts up to date on every membership change; only the
+        team row and the winners are read from the database.
+        """
+        team = self.team_repository.get_by_id(team_id)
+        if not team:
+            raise HTTPException(
+                status_code=404,
+                detail="Team not found"
+            )
         
-        # Bonus for same interest cluster (shared passion)
-        if requester.interest_cluster == candidate.interest_cluster:
-            base_score += 2.0
+        skill_index.refresh(self.db)
+        team_size, team_skills = skill_index.team_profile(team_id)
+        capacity = int(team.max_members) if str(team.max_members or "").isdigit() else 4
+        missing = skill_index.vocabulary() - team_skills
+        open_slots = max(capacity - team_size, 0)
+        
+        ranked, total_found = [], 0
+        if open_slots and missing and not team.is_locked:
+            candidate_ids = skill_index.candidates(skills=missing, unassigned_only=True)
+            total_found = len(candidate_ids)
+            # Most new skills first, then the rarer those skills are, then id
+            frequency = skill_index.skill_counts(missing)
+            ranked = heapq.nsmallest(limit, (
+                (-len(new_skills), -sum(1.0 / frequency[skill] for skill in new_skills), candidate_id, new_skills)
+                for candidate_id, new_skills in (
+                    (candidate_id, skill_index.skills_of(candidate_id) & missing) for candidate_id in candidate_ids
+                )
+            ))
         
-        return base_score
+        winners = {
+            participant.participant_id: participant
+            for participant in self.participant_repository.get_by_ids([entry[2] for entry in ranked])
+        }
+        candidates = [
+            GapFillCandidate(
+                participant=ParticipantResponse.from_orm(winners[candidate_id]),
+                new_skills=sorted(new_skills),
+                coverage_after=len(team_skills) + len(new_skills)
+            )
+            for _, _, candidate_id, new_skills in ranked
+            if candidate_id in winners
+        ]
+        
+        return TeamGapFillResponse(
+            team_id=team_id,
+            team_size=team_size,
+            open_slots=open_slots,
+            team_skills=sorted(team_skills),
+            missing_skills=sorted(missing),
+            candidates=candidates,
+            total_found=total_found
+        )
     
     def get_auto_team_suggestions(self) -> dict:
-        """Get suggestions for automatic team formation"""
-        # Get cluster distribution
-        cluster_distribution = self.participant_repository.get_cluster_distribution()
-        
-        # Get unassigned participants
-        unassigned = self.participant_repository.get_unassigned_participants()
-        
+        """Get a summary for automatic team formation (cached until the roster changes)"""
+        return _summary_cache.get_or_set(roster_version.value, self._build_auto_team_suggestions)
+    
+    def _build_auto_team_suggestions(self) -> dict:
+        # Two aggregate queries; no participant rows are loaded
+        return self.summarize_unassigned(
+            self.participant_repository.count_unassigned(),
+            self.participant_repository.get_unassigned_skill_counts()
+        )
+    
+    def summarize_unassigned(self, total_participants: int, skill_counts: Dict[str, int]) -> dict:
+        """Auto-team summary from the unassigned count and their per-skill counts"""
         # Calculate optimal team distribution
-        total_participants = len(unassigned)
-        optimal_teams = total_participants // 4
-        remaining_participants = total_participants % 4
+        optimal_teams = total_participants // TEAM_SIZE
+        remaining_participants = total_participants % TEAM_SIZE
         
-        suggestions = {
+        return {
             "total_participants": total_participants,
             "optimal_teams": optimal_teams,
             "remaining_participants": remaining_participants,
-            "cluster_distribution": cluster_distribution,
-            "recommendation": self._generate_auto_team_recommendation(
-                cluster_distribution, optimal_teams
+            "skill_distribution": dict(sorted(skill_counts.items(), key=lambda item: (-item[1], item[0]))),
+            "skill_coverage": self._skill_coverage(skill_counts, optimal_teams),
+            "recommendation": self._generate_auto_team_recommendation(skill_counts, optimal_teams)
+        }
+    
+    def _skill_coverage(self, skill_counts: Dict[str, int], team_count: int) -> dict:
+        """Upper bounds on how well the potential teams can cover the available skills"""
+        if team_count == 0:
+            return {"distinct_skills": len(skill_counts), "max_mean_skills_per_team": 0.0, "scarce_skills": []}
+        
+        # A skill held by c participants can appear in at most min(c, team_count) teams
+        reachable = sum(min(count, team_count) for count in skill_counts.values())
+        return {
+            "distinct_skills": len(skill_counts),
+            "max_mean_skills_per_team": round(reachable / team_count, 2),
+            "scarce_skills": sorted(
+                (skill for skill, count in skill_counts.items() if count < team_count),
+                key=lambda skill: (skill_counts[skill], skill)
             )
         }
-        
-        return suggestions
     
-    def _generate_auto_team_recommendation(self, cluster_distribution: dict, team_count: int) -> str:
+    def _generate_auto_team_recommendation(self, skill_counts: Dict[str, int], team_count: int) -> str:
         """Generate recommendation for automatic team formation"""
         if team_count == 0:
             return "Not enough participants to form teams"
         
-        # Calculate how many participants we need from each cluster per team
-        total_participants = sum(cluster_distribution.values())
-        participants_per_team = 4
-        
-        # Ideal distribution: try to have 1 participant from each cluster per team
-        ideal_distribution = {}
-        for cluster in range(1, 6):
-            cluster_count = cluster_distribution.get(cluster, 0)
-            ideal_distribution[cluster] = min(cluster_count, team_count)
-        
-        # Check if we can achieve good diversity
-        diverse_teams_possible = all(count > 0 for count in ideal_distribution.values())
+        scarce = [skill for skill, count in skill_counts.items() if count < team_count]
+        if not scarce:
+            return f"Can form {team_count} teams with every skill represented in each team"
         
-        if diverse_teams_possible:
-            return f"Can form {team_count} diverse teams with participants from all interest clusters"
-        else:
-            # Find which clusters are underrepresented
-            underrepresented = [cluster for cluster, count in ideal_distribution.items() if count == 0]
-            return f"Can form {team_count} teams, but clusters {underrepresented} are underrepresented"
+        # Name the scarcest skills first
+        scarce.sort(key=lambda skill: (skill_counts[skill], skill))
+        return f"Can form {team_count} teams, but {len(scarce)} skills are too scarce to reach every team: {', '.join(scarce[:5])}"
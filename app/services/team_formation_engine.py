@@ -0,0 +1,287 @@
+import heapq
+import multiprocessing
+import os
+import random
+import time
+import numpy as np
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+# Sharding only pays off above this many participants per shard
+MIN_SHARD_PARTICIPANTS = 1000
+# Share of the time budget given to the shards; the rest goes to the cross-shard repair
+SHARD_BUDGET_SHARE = 0.7
+
+class PoolParticipant(NamedTuple):
+    participant_id: str
+    skills: frozenset
+
+class PoolTeam(NamedTuple):
+    """An existing team that can take more members; its current members stay put"""
+    team_id: str
+    member_count: int
+    capacity: int
+    member_skills: frozenset
+
+class ProposedTeam(NamedTuple):
+    team_id: Optional[str]  # None for a team the engine wants created
+    existing_members: int
+    new_member_ids: List[str]
+    skills: frozenset
+
+class FormationResult(NamedTuple):
+    teams: List[ProposedTeam]
+    metrics: dict
+
+def form_teams(
+    participants: Sequence[PoolParticipant],
+    open_teams: Sequence[PoolTeam] = (),
+    team_size: int = 4,
+    seed: int = 0,
+    time_budget: float = 2.0,
+    max_iterations: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    workers: int = 1
+) -> FormationResult:
+    """Partition participants into teams, maximizing the distinct skills each team covers.
+
+    Existing open teams are filled first (smallest teams first), the rest go into new
+    teams of near-equal size no larger than team_size, so team sizes are fixed up front
+    and the search only decides who goes where. A greedy pass places participants with
+    the rarest skills first into the team they add the most new skills to, then random
+    pairwise swaps of newly placed participants are kept when they raise total coverage,
+    until the time budget or iteration cap runs out (or should_stop returns True). The
+    same seed and iteration cap give the same result.
+
+    With workers > 1, more than one CPU core and a large enough pool, the teams and
+    participants are split into shards that are solved in a process pool (see
+    _solve_sharded), and the swap search then runs over the merged result to repair
+    across shard boundaries. Each spawned shard pays about 1.5 s of start-up out of the
+    time budget, so sharding is opt-in; measure with benchmark_auto_assign.py first.
+    """
+    started = time.monotonic()
+    rng = random.Random(seed)
+    participants = sorted(participants, key=lambda p: p.participant_id)
+    open_teams = sorted(open_teams, key=lambda t: t.team_id)
+
+    targets = _target_sizes(len(participants), open_teams, team_size)
+    base_skills = [team.member_skills for team in open_teams] + [frozenset()] * (len(targets) - len(open_teams))
+    columns, counts = _prepare(participants, base_skills)
+
+    # More shards than cores only adds process start-up to the time budget
+    shards = min(workers, os.cpu_count() or 1, len(participants) // MIN_SHARD_PARTICIPANTS, len(targets))
+    if shards > 1:
+        row_of = {participant.participant_id: row for row, participant in enumerate(participants)}
+        members = [
+            [row_of[participant_id] for participant_id in team_members]
+            for team_members in _solve_sharded(participants, base_skills, targets, shards, seed, started, time_budget * SHARD_BUDGET_SHARE, max_iterations)
+        ]
+        for team, member_rows in enumerate(members):
+            for row in member_rows:
+                if columns[row]:
+                    counts[team, list(columns[row])] += 1
+    else:
+        members = _greedy(participants, columns, counts, targets)
+    initial_coverage = int((counts > 0).sum())
+
+    iterations = _local_search(members, columns, counts, rng, started, time_budget, max_iterations, should_stop)
+
+    teams = []
+    for team, member_rows in enumerate(members):
+        if team >= len(open_teams) and not member_rows:
+            continue
+        existing = open_teams[team] if team < len(open_teams) else None
+        skills = set(existing.member_skills) if existing else set()
+        for row in member_rows:
+            skills |= participants[row].skills
+        teams.append(ProposedTeam(
+            team_id=existing.team_id if existing else None,
+            existing_members=existing.member_count if existing else 0,
+            new_member_ids=sorted(participants[row].participant_id for row in member_rows),
+            skills=frozenset(skills)
+        ))
+
+    return FormationResult(teams=teams, metrics=formation_metrics(teams, {
+        "shards": max(shards, 1),
+        "initial_skill_coverage": initial_coverage,
+        "search_iterations": iterations,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1)
+    }))
+
+def _prepare(participants: Sequence[PoolParticipant], base_skills: Sequence[frozenset]):
+    """Skill column ids per participant and the per-team skill count matrix"""
+    vocabulary: Dict[str, int] = {}
+    for skills in base_skills:
+        for skill in skills:
+            vocabulary.setdefault(skill, len(vocabulary))
+    columns = [
+        tuple(sorted(vocabulary.setdefault(skill, len(vocabulary)) for skill in participant.skills))
+        for participant in participants
+    ]
+
+    # Per-team skill counts (existing members count once per skill; they never move)
+    counts = np.zeros((len(base_skills), max(len(vocabulary), 1)), dtype=np.int32)
+    for team, skills in enumerate(base_skills):
+        counts[team, [vocabulary[skill] for skill in skills]] = 1
+    return columns, counts
+
+def _solve_sharded(participants, base_skills, targets: List[int], shards: int, seed: int, started: float, time_budget: float, max_iterations: Optional[int]) -> List[List[str]]:
+    """Solve disjoint shards in parallel and return member ids per team.
+
+    Teams are dealt round-robin to shards, and each shard gets exactly as many
+    participants as its teams' targets add up to. Participants are dealt in order of
+    their skill profile, so every shard receives a similar mix of profiles rather
+    than one shard getting all participants with a given dominant skill. The shards'
+    time budget counts from the caller's start (the monotonic clock is shared by all
+    processes), so process start-up eats into it rather than extending it.
+    """
+    shard_teams: List[List[int]] = [[] for _ in range(shards)]
+    for team in range(len(targets)):
+        shard_teams[team % shards].append(team)
+    quotas = [sum(targets[team] for team in teams) for teams in shard_teams]
+
+    frequency = Counter(skill for participant in participants for skill in participant.skills)
+    by_profile = sorted(
+        participants,
+        key=lambda p: (tuple(sorted(p.skills, key=lambda skill: (-frequency[skill], skill))), p.participant_id)
+    )
+    shard_participants: List[List[PoolParticipant]] = [[] for _ in range(shards)]
+    shard = 0
+    for participant in by_profile:
+        while len(shard_participants[shard]) >= quotas[shard]:
+            shard = (shard + 1) % shards
+        shard_participants[shard].append(participant)
+        shard = (shard + 1) % shards
+
+    jobs = [
+        (
+            shard_participants[index],
+            [base_skills[team] for team in shard_teams[index]],
+            [targets[team] for team in shard_teams[index]],
+            seed + index,
+            started,
+            time_budget,
+            max_iterations
+        )
+        for index in range(shards)
+    ]
+    members: List[List[str]] = [[] for _ in targets]
+    with ProcessPoolExecutor(max_workers=shards, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for index, shard_members in enumerate(pool.map(_solve_shard, jobs)):
+            for team, team_members in zip(shard_teams[index], shard_members):
+                members[team] = team_members
+    return members
+
+def _solve_shard(job) -> List[List[str]]:
+    """Process pool entry point: greedy plus swap search over one shard"""
+    participants, base_skills, targets, seed, started, time_budget, max_iterations = job
+    columns, counts = _prepare(participants, base_skills)
+    members = _greedy(participants, columns, counts, targets)
+    _local_search(members, columns, counts, random.Random(seed), started, time_budget, max_iterations, None)
+    return [[participants[row].participant_id for row in member_rows] for member_rows in members]
+
+def formation_metrics(teams: Sequence[ProposedTeam], extra: Optional[dict] = None) -> dict:
+    """Skill coverage and size balance of a set of proposed teams"""
+    sizes = [team.existing_members + len(team.new_member_ids) for team in teams]
+    coverage = [len(team.skills) for team in teams]
+    metrics = {
+        "teams": len(teams),
+        "new_teams": sum(1 for team in teams if team.team_id is None),
+        "filled_teams": sum(1 for team in teams if team.team_id is not None and team.new_member_ids),
+        "participants_placed": sum(len(team.new_member_ids) for team in teams),
+        "skill_coverage": sum(coverage),
+        "mean_team_skills": round(sum(coverage) / len(coverage), 2) if coverage else 0.0,
+        "min_team_skills": min(coverage) if coverage else 0,
+        "team_sizes": dict(sorted(Counter(sizes).items())),
+        "size_spread": (max(sizes) - min(sizes)) if sizes else 0
+    }
+    metrics.update(extra or {})
+    return metrics
+
+def _target_sizes(count: int, open_teams: Sequence[PoolTeam], team_size: int) -> List[int]:
+    """Number of participants each team receives: open teams first, then new teams"""
+    free = [max(team.capacity - team.member_count, 0) for team in open_teams]
+    if count <= sum(free):
+        # Top up the smallest open teams first
+        targets = [0] * len(open_teams)
+        heap = [(team.member_count, index) for index, team in enumerate(open_teams) if free[index] > 0]
+        heapq.heapify(heap)
+        for _ in range(count):
+            size, index = heapq.heappop(heap)
+            targets[index] += 1
+            if targets[index] < free[index]:
+                heapq.heappush(heap, (size + 1, index))
+        return targets
+
+    remaining = count - sum(free)
+    new_teams = -(-remaining // team_size)
+    return free + [remaining // new_teams + (1 if i < remaining % new_teams else 0) for i in range(new_teams)]
+
+def _greedy(participants, columns, counts: np.ndarray, targets: List[int]) -> List[List[int]]:
+    # Rarest skills first: a participant with a skill few others have should anchor a team
+    frequency = Counter(column for row_columns in columns for column in row_columns)
+    order = sorted(
+        range(len(participants)),
+        key=lambda row: (-sum(1.0 / frequency[column] for column in columns[row]), -len(columns[row]), row)
+    )
+
+    members: List[List[int]] = [[] for _ in targets]
+    remaining = np.array(targets, dtype=np.int64)
+    placed = np.zeros(len(targets), dtype=np.int64)
+    for row in order:
+        open_slots = remaining > 0
+        gain = (counts[:, list(columns[row])] == 0).sum(axis=1) if columns[row] else np.zeros(len(targets), dtype=np.int64)
+        # Most new skills, then the emptiest team so far (argmax keeps team order on ties)
+        key = np.where(open_slots, gain * (max(targets) + 1) - placed, np.iinfo(np.int64).min)
+        team = int(np.argmax(key))
+        members[team].append(row)
+        remaining[team] -= 1
+        placed[team] += 1
+        if columns[row]:
+            counts[team, list(columns[row])] += 1
+    return members
+
+def _local_search(members, columns, counts: np.ndarray, rng: random.Random, started: float, time_budget: float, max_iterations: Optional[int], should_stop: Optional[Callable[[], bool]]) -> int:
+    movable = [team for team, member_rows in enumerate(members) if member_rows]
+    if len(movable) < 2:
+        return 0
+
+    # Give up once a long run of random swaps has found nothing better
+    patience = 50 * sum(len(members[team]) for team in movable)
+    counts_list = counts.tolist()
+    iterations = 0
+    since_improvement = 0
+    while (max_iterations is None or iterations < max_iterations) and since_improvement < patience:
+        if iterations % 256 == 0 and (time.monotonic() - started > time_budget or (should_stop and should_stop())):
+            break
+        iterations += 1
+        since_improvement += 1
+
+        a, b = rng.sample(movable, 2)
+        i = rng.randrange(len(members[a]))
+        j = rng.randrange(len(members[b]))
+        p, q = members[a][i], members[b][j]
+        p_columns, q_columns = set(columns[p]), set(columns[q])
+        if p_columns == q_columns:
+            continue
+
+        counts_a, counts_b = counts_list[a], counts_list[b]
+        delta = (
+            sum(1 for c in q_columns - p_columns if counts_a[c] == 0)
+            - sum(1 for c in p_columns - q_columns if counts_a[c] == 1)
+            + sum(1 for c in p_columns - q_columns if counts_b[c] == 0)
+            - sum(1 for c in q_columns - p_columns if counts_b[c] == 1)
+        )
+        if delta > 0:
+            for c in p_columns:
+                counts_a[c] -= 1
+                counts_b[c] += 1
+            for c in q_columns:
+                counts_b[c] -= 1
+                counts_a[c] += 1
+            members[a][i], members[b][j] = q, p
+            since_improvement = 0
+
+    counts[:] = np.array(counts_list, dtype=np.int32).reshape(counts.shape)
+    return iterations
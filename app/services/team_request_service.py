@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException
 from app.repositories.team_request_repository import TeamRequestRepository
 from app.repositories.participant_repository import ParticipantRepository
@@ -7,6 +7,7 @@ from app.repositories.team_repository import TeamRepository
 from app.schemas.team_request import TeamRequestCreate, TeamRequestResponse, TeamRequestUpdate, TeamRequestResponseResult
 from app.schemas.team import TeamResponse, TeamCreate
 from app.models.team_request import TeamRequest
+from app.core.events import event_broker
 from datetime import datetime
 
 class TeamRequestService:
@@ -53,6 +54,7 @@ class TeamRequestService:
             team_id=request_data.team_id,
             message=request_data.message
         )
+        self._publish(request, (request.to_participant_id, "request_received", True))
         
         return TeamRequestResponse.from_orm(request)
     
@@ -69,8 +71,14 @@ class TeamRequestService:
         if request.status != "pending":
             raise HTTPException(status_code=400, detail="Request already responded to")
         
-        # Update request status
-        self.request_repository.update_status(request_id, response.status, datetime.now())
+        # Update request status (only if still pending: it may have been cancelled or expired meanwhile)
+        if not self.request_repository.update_status(request_id, response.status, datetime.now()):
+            raise HTTPException(status_code=409, detail="Request is no longer pending")
+        self._publish(
+            request,
+            (request.from_participant_id, "request_responded", False),
+            (request.to_participant_id, "unread_count", True)
+        )
         
         if response.status == "accepted":
             # Handle team formation logic
@@ -123,17 +131,44 @@ class TeamRequestService:
             
             return self.team_repository.get_team_with_members(team.team_id)
     
-    def get_user_requests(self, participant_id: str) -> dict:
-        """Get all requests for a participant (incoming and outgoing)"""
-        
-        incoming = self.request_repository.get_incoming_requests(participant_id)
-        outgoing = self.request_repository.get_outgoing_requests(participant_id)
+    def get_user_requests(
+        self,
+        participant_id: str,
+        limit: Optional[int] = None,
+        incoming_cursor: Optional[str] = None,
+        outgoing_cursor: Optional[str] = None
+    ) -> dict:
+        """Get requests for a participant (incoming and outgoing), newest first.
+        
+        With a limit, each list is one page; pass back the returned *_cursor values to
+        get the next page (a cursor of None means there are no more rows).
+        """
+        
+        incoming = self.request_repository.get_incoming_requests(participant_id, limit, self._decode_cursor(incoming_cursor))
+        outgoing = self.request_repository.get_outgoing_requests(participant_id, limit, self._decode_cursor(outgoing_cursor))
         
         return {
             "incoming_requests": [TeamRequestResponse.from_orm(req) for req in incoming],
-            "outgoing_requests": [TeamRequestResponse.from_orm(req) for req in outgoing]
+            "outgoing_requests": [TeamRequestResponse.from_orm(req) for req in outgoing],
+            "incoming_cursor": self._encode_cursor(incoming, limit),
+            "outgoing_cursor": self._encode_cursor(outgoing, limit)
         }
     
+    def _encode_cursor(self, page: List[TeamRequest], limit: Optional[int]) -> Optional[str]:
+        if limit is None or len(page) < limit:
+            return None
+        last = page[-1]
+        return f"{last.created_at.isoformat()}|{last.request_id}"
+    
+    def _decode_cursor(self, cursor: Optional[str]) -> Optional[tuple]:
+        if not cursor:
+            return None
+        try:
+            created_at, request_id = cursor.split("|", 1)
+            return datetime.fromisoformat(created_at), request_id
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
     def cancel_request(self, request_id: str, from_participant_id: str) -> bool:
         """Cancel a sent request"""
         
@@ -147,4 +182,33 @@ class TeamRequestService:
         if request.status != "pending":
             raise HTTPException(status_code=400, detail="Cannot cancel responded request")
         
-        return self.request_repository.delete(request_id)
+        event = self._event_data(request)
+        to_participant_id = request.to_participant_id
+        if not self.request_repository.delete(request_id, pending_only=True):
+            raise HTTPException(status_code=409, detail="Request is no longer pending")
+        event["status"] = "cancelled"
+        event["unread_count"] = self.request_repository.count_pending_incoming(to_participant_id)
+        event_broker.publish(to_participant_id, "request_cancelled", event)
+        return True
+    
+    def _publish(self, request: TeamRequest, *events: Tuple[str, str, bool]) -> None:
+        """Push request events, given as (participant_id, event, with_unread_count), to the participants' open streams"""
+        data = self._event_data(request)
+        event_broker.publish_many([
+            (
+                participant_id,
+                event,
+                {**data, "unread_count": self.request_repository.count_pending_incoming(participant_id)} if with_unread_count else data
+            )
+            for participant_id, event, with_unread_count in events
+        ])
+    
+    def _event_data(self, request: TeamRequest) -> dict:
+        # Ids only: NOTIFY payloads are capped at 8000 bytes, and clients fetch details on demand
+        return {
+            "request_id": request.request_id,
+            "from_participant_id": request.from_participant_id,
+            "to_participant_id": request.to_participant_id,
+            "team_id": request.team_id,
+            "status": request.status
+        }
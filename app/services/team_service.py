@@ -3,10 +3,17 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.repositories.team_repository import TeamRepository
 from app.repositories.participant_repository import ParticipantRepository
-from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamJoin
+from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamJoin, TeamSearchResult, TeamChanges
+from app.models.team import Team
+from app.services.change_feed import paginate_changes
 from app.schemas.participant import ParticipantResponse
+from app.core.cache import TTLCache
+from app.core.config import settings
 from fastapi import HTTPException
 
+# Short-lived cache for typeahead queries, keyed by normalized query and limit
+_search_cache = TTLCache(max_entries=1024, ttl_seconds=settings.search_cache_ttl_seconds, name="team_search")
+
 class TeamService:
     def __init__(self, db: Session):
         self.db = db
@@ -76,6 +83,42 @@ class TeamService:
         
         return team_responses
     
+    def search_teams(self, query: str, limit: Optional[int] = None) -> List[TeamSearchResult]:
+        """Search teams by partial name for search-as-you-type"""
+        normalized = " ".join(query.split()).lower()
+        limit = min(limit or settings.search_result_limit, settings.search_result_limit)
+        
+        def run_search() -> List[TeamSearchResult]:
+            results = []
+            for team, member_count in self.team_repository.search(normalized, limit):
+                result = TeamSearchResult.from_orm(team)
+                result.member_count = member_count
+                results.append(result)
+            return results
+        
+        return _search_cache.get_or_set((normalized, limit), run_search)
+    
+    def get_team_changes(self, since: int, limit: int, open_only: bool = False) -> TeamChanges:
+        """Get changes to the team list since a change cursor"""
+        changed = self.team_repository.get_changed_since(since, limit + 1)
+        deleted = self.team_repository.get_deleted_since(since, limit + 1)
+        page, cursor, has_more = paginate_changes(changed, deleted, since, limit)
+        
+        upserted = []
+        removed = []
+        for item in page:
+            if not isinstance(item, Team):
+                removed.append(item.entity_id)
+            elif open_only and (item.is_locked or not item.is_open_to_requests):
+                # Locked or closed, so it leaves the open team list
+                removed.append(item.team_id)
+            else:
+                team_response = TeamResponse.from_orm(item)
+                team_response.member_count = len(team_response.members)
+                upserted.append(team_response)
+        
+        return TeamChanges(cursor=cursor, has_more=has_more, upserted=upserted, removed=removed)
+    
     def update_team(self, team_id: str, team_data: TeamUpdate) -> TeamResponse:
         """Update team information"""
         team = self.team_repository.update(team_id, team_data)